@@ -2,13 +2,29 @@
 
 Uses TexSoup for proper AST-based parsing instead of fragile regex.
 Handles nested structures, math environments, and Beamer-specific elements.
+
+Parsing is the slow step, so converted sections are cached under a hash of
+the source, the chart map and the parser's own code; unchanged decks skip
+TexSoup.
 """
 
 from TexSoup import TexSoup
 from TexSoup.data import TexNode, TexText
 from pathlib import Path
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional
+import json
 import re
+import tempfile
+
+from utils.build_cache import BuildCache
+from utils.hash_utils import compute_file_hash, compute_string_hash
+
+# Modules whose code shapes the cached HTML; any edit to them invalidates it
+PARSER_SOURCES = [Path(__file__)]
+PARSER_VERSION = compute_string_hash("\n".join(
+    compute_file_hash(source) for source in PARSER_SOURCES
+))
+CACHE_ENTRY = "parsed.json"
 
 
 # Color mapping from LaTeX to CSS hex
@@ -27,16 +43,22 @@ COLORS = {
 class BeamerParserV2:
     """Parse Beamer LaTeX using TexSoup AST and convert to Reveal.js HTML."""
 
-    def __init__(self, tex_file: Path, chart_map: dict = None):
+    def __init__(self, tex_file: Path, chart_map: dict = None, cache: Optional[BuildCache] = None):
         self.tex_file = Path(tex_file)
         self.chart_map = chart_map or {}
         self.lecture_name = self.tex_file.parent.name
-
-        # Read and parse content
-        content = self.tex_file.read_text(encoding='utf-8')
-        # Pre-process to help TexSoup
-        content = self._preprocess(content)
-        self.soup = TexSoup(content)
+        self.cache = cache or BuildCache("beamer_parse")
+        self.cache_hit = False
+
+        # Read content; it is pre-processed and parsed only on a cache miss
+        self.content = self.tex_file.read_text(encoding='utf-8')
+        self.cache_key = compute_string_hash("\n".join([
+            self.content,
+            self.lecture_name,
+            json.dumps(self.chart_map, sort_keys=True),
+            PARSER_VERSION
+        ]))
+        self._soup = None
 
         self.metadata = {
             'title': 'Untitled',
@@ -45,6 +67,14 @@ class BeamerParserV2:
             'date': ''
         }
 
+    @property
+    def soup(self) -> TexNode:
+        """TexSoup tree of the pre-processed source (parsed on first use)."""
+        if self._soup is None:
+            # Pre-process to help TexSoup
+            self._soup = TexSoup(self._preprocess(self.content))
+        return self._soup
+
     def _preprocess(self, content: str) -> str:
         """Pre-process LaTeX to help TexSoup parse correctly."""
         # First, protect escaped dollar signs by replacing with placeholder
@@ -95,7 +125,22 @@ class BeamerParserV2:
         return '\n'.join(lines)
 
     def parse(self) -> Tuple[List[str], Dict]:
-        """Parse the .tex file and return sections and metadata."""
+        """Parse the .tex file and return sections and metadata.
+
+        Sections and metadata from an earlier parse of the same source
+        and chart map are reused (cache_hit is then True).
+        """
+        cached = self.cache.lookup(self.cache_key, CACHE_ENTRY)
+        if cached:
+            try:
+                with open(cached, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                self.metadata = entry['metadata']
+                self.cache_hit = True
+                return entry['sections'], self.metadata
+            except (json.JSONDecodeError, KeyError, OSError):
+                pass
+
         # Extract metadata
         self._extract_metadata()
 
@@ -109,8 +154,17 @@ class BeamerParserV2:
             if section_html:
                 sections.append(section_html)
 
+        self._store(sections)
         return sections, self.metadata
 
+    def _store(self, sections: List[str]) -> None:
+        """Cache the converted sections and metadata under the source key."""
+        with tempfile.TemporaryDirectory(prefix="beamer-") as tmp:
+            entry = Path(tmp) / CACHE_ENTRY
+            with open(entry, 'w', encoding='utf-8') as f:
+                json.dump({'sections': sections, 'metadata': self.metadata}, f)
+            self.cache.store(self.cache_key, entry)
+
     def _extract_metadata(self) -> None:
         """Extract title, subtitle, author from preamble."""
         # Title
@@ -0,0 +1,285 @@
+"""Build graph for minimal rebuilds after a change.
+
+Nodes are chart scripts (chart.py -> chart.pdf), decks (.tex -> .pdf) and
+published web slides (deck PDF -> docs/slides PNG/HTML). A deck depends
+on the charts whose chart.pdf it includes; a web node depends on its deck.
+Given the files that changed, only the nodes reading them and everything
+downstream are rebuilt, in dependency order, with independent nodes
+running concurrently.
+"""
+import os
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from utils.build_cache import BuildCache
+from utils.job_limits import MAX_RSS_MB, JobHistory
+
+from .chart_builder import (
+    CHART_STYLE_PATH, _build_chart, _child_environment, _datasets_read, _environment_key
+)
+from .deck_deps import scan_dependencies
+from .pdf_optimizer import optimize_pdf
+from .slide_builder import DEFAULT_MAX_PASSES, CompileService, get_topic_dir, find_decks
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+WEB_DIR = PROJECT_ROOT / "docs" / "slides"
+WEB_PDF_DIR = WEB_DIR / "pdf"
+SECTIONS_DIR = WEB_DIR / "sections"
+WEB_DPI = 150
+
+CHART, DECK, WEB = "chart", "deck", "web"
+KINDS = (CHART, DECK, WEB)
+
+
+class BuildGraph:
+    """Charts, decks and web slides of the selected topics, with their inputs."""
+
+    def __init__(self, manifest: dict, topic: str = None):
+        self.nodes: Dict[str, Dict] = {}
+        self.dependents: Dict[str, set] = {}
+        # Input file (relative posix path) -> nodes that read it
+        self.inputs: Dict[str, set] = {}
+
+        topics = manifest["topics"]
+        if topic:
+            topics = [t for t in topics if t["id"] == topic]
+
+        for t in topics:
+            topic_dir = get_topic_dir(t)
+            if not topic_dir.exists():
+                continue
+            for script in sorted(topic_dir.glob("*/chart.py")):
+                self._add_chart(script)
+            for deck in find_decks(topic_dir):
+                self._add_deck(deck)
+
+    def affected(self, changed: Iterable[str], kinds: Iterable[str] = KINDS) -> List[str]:
+        """Nodes to rebuild for *changed* files, in dependency order.
+
+        Args:
+            changed: Changed files, relative to the project root
+            kinds: Node kinds to keep (others are left out of the result)
+
+        Returns:
+            Node IDs, each after the nodes it depends on
+        """
+        changed = set(changed)
+        pending = [n for path in changed for n in self.inputs.get(path, ())]
+        if CHART_STYLE_PATH.relative_to(PROJECT_ROOT).as_posix() in changed:
+            pending.extend(n for n, node in self.nodes.items() if node["kind"] == CHART)
+
+        reached = set()
+        while pending:
+            node_id = pending.pop()
+            if node_id not in reached:
+                reached.add(node_id)
+                pending.extend(self.dependents.get(node_id, ()))
+
+        kinds = set(kinds)
+        return [n for n in self._topological_order() if n in reached and self.nodes[n]["kind"] in kinds]
+
+    def _add_chart(self, script: Path) -> None:
+        node_id = f"{CHART}:{_rel(script)}"
+        self._add_node(node_id, CHART, script, [])
+        self._add_input(script, node_id)
+        for dataset in _datasets_read(script):
+            self._add_input(dataset, node_id)
+
+    def _add_deck(self, tex_path: Path) -> None:
+        node_id = f"{DECK}:{_rel(tex_path)}"
+        deps = []
+        self._add_input(tex_path, node_id)
+        for dep in scan_dependencies(tex_path):
+            self._add_input(dep, node_id)
+            chart_id = f"{CHART}:{_rel(dep.parent / 'chart.py')}"
+            if dep.name == "chart.pdf" and chart_id in self.nodes:
+                deps.append(chart_id)
+        self._add_node(node_id, DECK, tex_path, deps)
+
+        # Only decks already published to docs/slides get a web node
+        published = WEB_PDF_DIR / tex_path.with_suffix(".pdf").name
+        if published.exists():
+            web_id = f"{WEB}:{tex_path.stem}"
+            self._add_node(web_id, WEB, tex_path, [node_id])
+            self._add_input(published, web_id)
+            self._add_input(SECTIONS_DIR / f"{tex_path.stem}.json", web_id)
+
+    def _add_node(self, node_id: str, kind: str, path: Path, deps: List[str]) -> None:
+        self.nodes[node_id] = {"kind": kind, "path": path, "deps": deps}
+        for dep in deps:
+            self.dependents.setdefault(dep, set()).add(node_id)
+
+    def _add_input(self, path: Path, node_id: str) -> None:
+        self.inputs.setdefault(_rel(path), set()).add(node_id)
+
+    def _topological_order(self) -> List[str]:
+        # Nodes are added after their dependencies, charts before decks
+        # before web, so insertion order already is one
+        return list(self.nodes)
+
+
+def changed_files(since: str = "HEAD") -> Optional[List[str]]:
+    """Files changed since git revision *since*, including untracked files.
+
+    Returns:
+        Paths relative to the project root, or None if git failed
+    """
+    commands = [
+        ["git", "diff", "--name-only", since, "--"],
+        ["git", "ls-files", "--others", "--exclude-standard"],
+    ]
+    files = []
+    for command in commands:
+        try:
+            result = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            print(f"  [FAIL] {' '.join(command[:2])}: {result.stderr.strip()}")
+            return None
+        files.extend(line.strip() for line in result.stdout.splitlines() if line.strip())
+    return sorted(set(files))
+
+
+def build_changed(
+    manifest: dict,
+    since: str = "HEAD",
+    kinds: Iterable[str] = KINDS,
+    topic: str = None,
+    verbose: bool = False,
+    jobs: int = None,
+    max_rss_mb: float = None,
+    max_passes: int = DEFAULT_MAX_PASSES,
+    use_format: bool = True,
+    force: bool = False
+) -> bool:
+    """
+    Rebuild what is affected by the files changed since a git revision.
+
+    Charts and decks still go through the chart cache and the deck
+    up-to-date check, so a node reached only through an unchanged output
+    finishes quickly.
+
+    Args:
+        manifest: Course manifest
+        since: Git revision to compare against ("HEAD" for uncommitted changes)
+        kinds: Node kinds to rebuild (chart, deck, web)
+        topic: Topic ID to restrict the graph to (None for all)
+        verbose: Show detailed output
+        jobs: Number of nodes built concurrently (None for CPU count)
+        max_rss_mb: Memory cap per chart script / pdflatex run in MB
+        max_passes: Upper bound on pdflatex passes per deck
+        use_format: Compile decks against a precompiled preamble format
+        force: Rebuild affected charts and decks even if they are up to date
+
+    Returns:
+        True if all affected nodes build
+    """
+    changed = changed_files(since)
+    if changed is None:
+        return False
+
+    graph = BuildGraph(manifest, topic)
+    order = graph.affected(changed, kinds)
+    print(f"\n  {len(changed)} changed file(s) since {since}, {len(order)} node(s) to rebuild")
+    if not order:
+        return True
+
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    max_rss_mb = MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+    chart_history = JobHistory("charts")
+    chart_limits = {"max_rss_mb": max_rss_mb, "history": chart_history, "env": _child_environment(jobs)}
+    chart_context = (BuildCache("charts"), _environment_key(), force, None, False, chart_limits)
+    service = CompileService(verbose, max_rss_mb, max_passes, use_format, force)
+
+    def build(node_id: str) -> dict:
+        node = graph.nodes[node_id]
+        if node["kind"] == CHART:
+            return _build_chart(node["path"], verbose, *chart_context)
+        if node["kind"] == DECK:
+            return service.compile(node["path"])
+        return _publish_deck(node["path"])
+
+    results = _run_in_order(graph, order, build, jobs)
+
+    chart_history.save()
+    service.save()
+
+    failed = [n for n in order if not results[n]["passed"]]
+    print(f"\n  Nodes: {len(order) - len(failed)}/{len(order)} passed")
+    for node_id in failed:
+        print(f"    - {node_id}")
+    return not failed
+
+
+def _run_in_order(graph: BuildGraph, order: List[str], build, jobs: int) -> Dict[str, dict]:
+    """Build *order* on a thread pool, starting each node once its dependencies pass."""
+    selected = set(order)
+    waiting = {n: [d for d in graph.nodes[n]["deps"] if d in selected] for n in order}
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        running = {}
+        while waiting or running:
+            for node_id in list(waiting):
+                deps = waiting[node_id]
+                if any(d not in results for d in deps):
+                    continue
+                del waiting[node_id]
+                failed = [d for d in deps if not results[d]["passed"]]
+                if failed:
+                    results[node_id] = {"passed": False, "lines": [f"  [SKIP] {node_id} - {failed[0]} failed"]}
+                    print(results[node_id]["lines"][0])
+                else:
+                    running[pool.submit(build, node_id)] = node_id
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node_id = running.pop(future)
+                results[node_id] = future.result()
+                for line in results[node_id]["lines"]:
+                    print(line)
+
+    return results
+
+
+def _publish_deck(tex_path: Path) -> dict:
+    """Publish a deck's PDF (web-optimized) to docs/slides/pdf and regenerate its slide images and HTML."""
+    pdf_path = tex_path.with_suffix(".pdf")
+    lines = [f"  Publishing {pdf_path.name}..."]
+    start = time.perf_counter()
+
+    def finish(passed: bool, message: str) -> dict:
+        lines.append(message)
+        return {"passed": passed, "duration": time.perf_counter() - start, "lines": lines}
+
+    if not pdf_path.exists():
+        return finish(False, f"    [FAIL] {pdf_path.name} not built")
+
+    try:
+        # pdf2image is optional; imported here so chart/deck builds work without it
+        from pdf_to_revealjs import convert_pdf
+    except ImportError as e:
+        return finish(False, f"    [FAIL] {e}")
+
+    published = WEB_PDF_DIR / pdf_path.name
+    optimized = optimize_pdf(pdf_path, published)
+    lines.extend(optimized["lines"])
+    try:
+        html_path = convert_pdf(published, WEB_DIR, WEB_DPI, SECTIONS_DIR, lines=lines)
+    except Exception as e:
+        return finish(False, f"    [FAIL] {e}")
+    return finish(True, f"    [PASS] {html_path.relative_to(PROJECT_ROOT).as_posix()}")
+
+
+def _rel(path: Path) -> str:
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(PROJECT_ROOT.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
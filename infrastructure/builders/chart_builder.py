@@ -1,12 +1,48 @@
 """Chart builder - runs chart.py scripts."""
+import json
+import os
+import platform
+import re
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
 from pathlib import Path
 
+from utils.build_cache import BuildCache
+from utils.hash_utils import compute_file_hash, compute_string_hash
+from utils.job_limits import MAX_RSS_MB, JobHistory, crash_signal, exceeded_memory, limited_command
+
+from . import chart_profiler
+from .chart_worker import ChartWorkerPool
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+RUNNER_SCRIPT = Path(__file__).parent / "chart_runner.py"
+CHART_STYLE_PATH = PROJECT_ROOT / "templates" / "chart_style.py"
+DATASETS_DIR = PROJECT_ROOT / "datasets"
+
+# Libraries whose versions can change chart output
+CHART_LIBRARIES = ["numpy", "matplotlib", "scikit-learn", "scipy", "pandas", "seaborn"]
 
+# Web exports written next to chart.pdf (chart_style.install_web_export)
+WEB_OUTPUTS = ["chart.png", "chart.svg", "chart.webp"]
 
-def build_charts(manifest: dict, topic: str = None, verbose: bool = False) -> bool:
+# Number of entries shown in the "slowest charts" summary
+SLOWEST_SHOWN = 5
+
+
+def build_charts(
+    manifest: dict,
+    topic: str = None,
+    verbose: bool = False,
+    jobs: int = None,
+    force: bool = False,
+    warm: bool = False,
+    profile: bool = False,
+    max_rss_mb: float = None
+) -> bool:
     """
     Build charts by running chart.py scripts.
 
@@ -14,64 +50,307 @@ def build_charts(manifest: dict, topic: str = None, verbose: bool = False) -> bo
         manifest: Course manifest
         topic: Topic ID to build (None for all)
         verbose: Show detailed output
+        jobs: Number of charts built concurrently (None for CPU count)
+        force: Rerun every script, ignoring the build cache
+        warm: Run scripts in warm worker processes instead of a fresh
+            interpreter per chart
+        profile: Record wall/CPU time, peak memory and an import /
+            compute / savefig breakdown per chart (bypasses the cache)
+        max_rss_mb: Memory cap per chart script in MB (None for
+            COURSE_MAX_RSS_MB, off by default; 0 to disable)
 
     Returns:
         True if all builds succeed
     """
-    all_passed = True
+    jobs = max(1, jobs or os.cpu_count() or 1)
     topics = manifest["topics"]
 
     if topic:
         topics = [t for t in topics if t["id"] == topic]
 
+    # Collect jobs per topic so output stays grouped and ordered
+    plan = []
     for t in topics:
-        charts = t.get("assets", {}).get("charts", [])
-        print(f"\n  Building charts for {t['id']}...")
+        scripts = []
+        for chart in t.get("assets", {}).get("charts", []):
+            chart_path = PROJECT_ROOT / chart.get("file", "")
+            if not chart_path.exists():
+                scripts.append((chart, None))
+            else:
+                scripts.append((chart, chart_path))
+        plan.append((t, scripts))
 
-        for chart in charts:
-            chart_file = chart.get("file", "")
-            chart_path = PROJECT_ROOT / chart_file
+    cache = BuildCache("charts")
+    env_key = _environment_key()
+    history = JobHistory("charts")
+    limits = {
+        "max_rss_mb": MAX_RSS_MB if max_rss_mb is None else max_rss_mb,
+        "history": history,
+        "env": _child_environment(jobs)
+    }
 
-            if not chart_path.exists():
-                print(f"    [SKIP] {chart['id']} - chart.py not found")
-                continue
+    workers = ChartWorkerPool(memory_limit_mb=limits["max_rss_mb"], env=limits["env"]) if warm else None
+
+    results = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        def submit(path):
+            # Profiling needs a real run, so it bypasses the cache
+            return pool.submit(
+                _build_chart, path, verbose, cache, env_key, force or profile, workers, profile, limits
+            )
+
+        # Submit everything up front, then report in manifest order
+        futures = [
+            (t, [(chart, submit(path) if path else None) for chart, path in scripts])
+            for t, scripts in plan
+        ]
+
+        for t, charts in futures:
+            print(f"\n  Building charts for {t['id']}...")
+
+            for chart, future in charts:
+                if future is None:
+                    print(f"    [SKIP] {chart['id']} - chart.py not found")
+                    continue
+
+                result = future.result()
+                for line in result["lines"]:
+                    print(line)
+                results.append(result)
 
-            passed = _run_chart_script(chart_path, verbose)
-            if not passed:
-                all_passed = False
+    if workers is not None:
+        workers.close()
+    history.save()
 
-    return all_passed
+    if profile:
+        chart_profiler.save_profile_run({
+            r["script"].relative_to(PROJECT_ROOT).as_posix(): r["profile"]
+            for r in results if r.get("profile")
+        })
+
+    _print_summary(results)
+    return all(r["passed"] for r in results)
+
+
+def _build_chart(
+    script_path: Path,
+    verbose: bool,
+    cache: BuildCache,
+    env_key: str,
+    force: bool,
+    workers: ChartWorkerPool = None,
+    profile: bool = False,
+    limits: dict = None
+) -> dict:
+    """Restore a chart from the build cache, or run its script and cache the PDF."""
+    pdf_path = script_path.parent / "chart.pdf"
+    key = chart_cache_key(script_path, env_key)
+
+    if not force and cache.restore(key, pdf_path):
+        # Restored after the PDF so they stay at least as new as it
+        for name in WEB_OUTPUTS:
+            cache.restore(key, script_path.parent / name)
+        return {
+            "name": script_path.parent.name,
+            "script": script_path,
+            "passed": True,
+            "cached": True,
+            "killed": None,
+            "duration": 0.0,
+            "profile": None,
+            "lines": [
+                f"    Running {script_path.parent.name}/chart.py...",
+                f"      [CACHED] chart.pdf ({pdf_path.stat().st_size} bytes)",
+            ],
+        }
+
+    result = _run_chart_script(script_path, verbose, workers, profile, limits)
+    if result["passed"]:
+        cache.store(key, pdf_path)
+        for name in WEB_OUTPUTS:
+            web_path = script_path.parent / name
+            if web_path.exists() and web_path.stat().st_mtime >= pdf_path.stat().st_mtime:
+                cache.store(key, web_path)
+    return result
+
+
+def chart_cache_key(script_path: Path, env_key: str = None) -> str:
+    """Content key for a chart: script, datasets it reads and environment.
+
+    Args:
+        script_path: Path to chart.py
+        env_key: Precomputed result of _environment_key()
+
+    Returns:
+        Hexadecimal key string
+    """
+    parts = [f"script:{compute_file_hash(script_path)}", f"env:{env_key or _environment_key()}"]
+    for dataset in _datasets_read(script_path):
+        parts.append(f"{dataset.name}:{compute_file_hash(dataset)}")
+    return compute_string_hash("\n".join(parts))
 
 
-def _run_chart_script(script_path: Path, verbose: bool) -> bool:
-    """Run a chart.py script."""
-    print(f"    Running {script_path.parent.name}/chart.py...")
+def _environment_key() -> str:
+    """Hash of chart_style.py and the Python/library versions."""
+    parts = [f"python:{platform.python_version()}"]
+    if CHART_STYLE_PATH.exists():
+        parts.append(f"chart_style:{compute_file_hash(CHART_STYLE_PATH)}")
+    for lib in CHART_LIBRARIES:
+        try:
+            parts.append(f"{lib}:{metadata.version(lib)}")
+        except metadata.PackageNotFoundError:
+            parts.append(f"{lib}:none")
+    return compute_string_hash("\n".join(parts))
+
+
+def _child_environment(jobs: int) -> dict:
+    """Environment overrides for chart scripts run *jobs* at a time.
+
+    chart_style.parallel_trials defaults to one worker per CPU, so with
+    several charts running at once each script gets its share of the CPUs
+    instead. An explicit CHART_TRIAL_WORKERS is left alone.
+    """
+    if jobs <= 1 or os.environ.get("CHART_TRIAL_WORKERS"):
+        return {}
+    return {"CHART_TRIAL_WORKERS": str(max(1, (os.cpu_count() or 1) // jobs))}
+
+
+def _datasets_read(script_path: Path) -> list:
+    """Return the datasets/*.csv files referenced by a chart script."""
+    if not DATASETS_DIR.exists():
+        return []
+    content = script_path.read_text(encoding="utf-8", errors="ignore")
+    names = sorted(set(re.findall(r"([\w.-]+\.csv)\b", content)))
+    return [DATASETS_DIR / n for n in names if (DATASETS_DIR / n).exists()]
+
+
+def _run_chart_script(
+    script_path: Path,
+    verbose: bool,
+    workers: ChartWorkerPool = None,
+    profile: bool = False,
+    limits: dict = None
+) -> dict:
+    """Run a chart.py script.
+
+    Output is buffered so concurrent runs can be printed in order.
+    With *workers* the script runs in a warm worker process; with
+    *profile* it runs under chart_profiler. *limits* holds the memory
+    cap, the JobHistory that sets the timeout and records the run, and
+    environment overrides for the script.
+
+    Returns:
+        Dict with name, passed, killed, duration, profile and the
+        buffered output lines
+    """
+    name = script_path.parent.name
+    lines = [f"    Running {name}/chart.py..."]
+    start = time.perf_counter()
+    passed = False
+    killed = None
+    timings = None
+
+    limits = limits or {}
+    history = limits.get("history")
+    max_rss_mb = limits.get("max_rss_mb", 0)
+    env = {**os.environ, **limits["env"]} if limits.get("env") else None
+    job = script_path.relative_to(PROJECT_ROOT).as_posix()
+    timeout = history.timeout_for(job) if history else 120
 
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            cwd=script_path.parent,
-            capture_output=not verbose,
-            text=True,
-            timeout=120
-        )
-
-        if result.returncode != 0:
-            print(f"      [FAIL] {result.stderr[:200] if result.stderr else 'Unknown error'}")
-            return False
-
-        # Check if PDF was created
-        pdf_path = script_path.parent / "chart.pdf"
-        if pdf_path.exists() and pdf_path.stat().st_size > 0:
-            print(f"      [PASS] chart.pdf ({pdf_path.stat().st_size} bytes)")
-            return True
+        if workers is not None:
+            result = workers.run(script_path, timeout=timeout, profile=profile)
+            timings = result.profile
+        elif profile:
+            with tempfile.TemporaryDirectory() as tmp:
+                profile_json = Path(tmp) / "profile.json"
+                result = subprocess.run(
+                    limited_command(
+                        [sys.executable, str(RUNNER_SCRIPT), str(script_path), str(profile_json)], max_rss_mb
+                    ),
+                    cwd=script_path.parent,
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout
+                )
+                if profile_json.exists():
+                    timings = json.loads(profile_json.read_text(encoding="utf-8"))
+        else:
+            result = subprocess.run(
+                limited_command([sys.executable, str(RUNNER_SCRIPT), str(script_path)], max_rss_mb),
+                cwd=script_path.parent,
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+
+        if verbose:
+            lines.extend(result.stdout.rstrip().splitlines())
+            lines.extend(result.stderr.rstrip().splitlines())
+
+        if result.returncode != 0 and max_rss_mb and exceeded_memory(result.returncode, result.stderr):
+            killed = "memory"
+            lines.append(f"      [KILLED] Exceeded memory limit ({max_rss_mb:.0f} MB)")
+        elif crash_signal(result.returncode):
+            lines.append(f"      [FAIL] Crashed ({crash_signal(result.returncode)})")
+        elif result.returncode != 0:
+            # The exception is at the end; the start is traceback frames
+            errors = result.stderr.strip().splitlines() if result.stderr else []
+            lines.append(f"      [FAIL] {errors[-1] if errors else 'Unknown error'}")
         else:
-            print(f"      [FAIL] PDF not generated")
-            return False
+            # Check if PDF was created
+            pdf_path = script_path.parent / "chart.pdf"
+            if pdf_path.exists() and pdf_path.stat().st_size > 0:
+                lines.append(f"      [PASS] chart.pdf ({pdf_path.stat().st_size} bytes)")
+                passed = True
+            else:
+                lines.append(f"      [FAIL] PDF not generated")
 
     except subprocess.TimeoutExpired:
-        print(f"      [FAIL] Timed out")
-        return False
+        killed = "timeout"
+        lines.append(f"      [KILLED] Exceeded time limit ({timeout:.0f}s)")
     except Exception as e:
-        print(f"      [FAIL] {e}")
-        return False
+        lines.append(f"      [FAIL] {e}")
+
+    duration = time.perf_counter() - start
+    if passed and history is not None:
+        history.record(job, duration)
+    if timings is not None:
+        timings["wall_s"] = round(duration, 4)
+        timings["passed"] = passed
+
+    return {
+        "name": name,
+        "script": script_path,
+        "passed": passed,
+        "cached": False,
+        "killed": killed,
+        "duration": duration,
+        "profile": timings,
+        "lines": lines,
+    }
+
+
+def _print_summary(results: list) -> None:
+    """Print failures and the slowest charts of a build."""
+    if not results:
+        return
+
+    failed = [r for r in results if not r["passed"]]
+    cached = sum(1 for r in results if r["cached"])
+    print(f"\n  Charts: {len(results) - len(failed)}/{len(results)} passed ({cached} from cache)")
+
+    if failed:
+        print("  Failed:")
+        for r in failed:
+            reason = f" (killed: {r['killed']} limit)" if r.get("killed") else ""
+            print(f"    - {r['script'].relative_to(PROJECT_ROOT).as_posix()}{reason}")
+
+    executed = [r for r in results if not r["cached"]]
+    slowest = sorted(executed, key=lambda r: r["duration"], reverse=True)[:SLOWEST_SHOWN]
+    if slowest:
+        print("  Slowest:")
+    for r in slowest:
+        print(f"    {r['duration']:6.1f}s  {r['name']}")
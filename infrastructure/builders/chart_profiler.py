@@ -0,0 +1,155 @@
+"""Chart profiler - per-chart import / compute / savefig timings.
+
+Installed around a chart script by chart_runner (given a profile path)
+or by the warm chart worker. Time spent in top-level imports and in
+``Figure.savefig`` (which ``plt.savefig`` and ``chart_style.save_chart``
+both go through) is accumulated separately. Everything else counts as
+computation.
+"""
+import builtins
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+PROFILE_FILE = "chart_profile.json"
+
+# Number of profiled runs kept for run-over-run comparisons
+MAX_RUNS = 10
+
+_state = {
+    "installed": False,
+    "depth": 0,
+    "import_s": 0.0,
+    "savefig_s": 0.0,
+    "saving": False,
+    "wall_start": 0.0,
+    "cpu_start": 0.0,
+}
+
+
+def install() -> None:
+    """Hook imports and Figure.savefig and start the clocks."""
+    if not _state["installed"]:
+        builtins.__import__ = _timed_import(builtins.__import__)
+        _state["installed"] = True
+        _patch_savefig()
+    reset()
+
+
+def reset() -> None:
+    """Zero the counters before profiling the next script."""
+    _state["import_s"] = 0.0
+    _state["savefig_s"] = 0.0
+    _state["wall_start"] = time.perf_counter()
+    _state["cpu_start"] = time.process_time()
+
+
+def snapshot() -> Dict:
+    """Timings and memory since the last reset()."""
+    wall = time.perf_counter() - _state["wall_start"]
+    return {
+        "script_s": round(wall, 4),
+        "cpu_s": round(time.process_time() - _state["cpu_start"], 4),
+        "import_s": round(_state["import_s"], 4),
+        "savefig_s": round(_state["savefig_s"], 4),
+        "compute_s": round(max(0.0, wall - _state["import_s"] - _state["savefig_s"]), 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def write_snapshot(output: str) -> None:
+    """Write snapshot() to *output* as JSON."""
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f)
+
+
+def _timed_import(original):
+    def timed_import(*args, **kwargs):
+        if _state["depth"]:
+            return original(*args, **kwargs)
+
+        _state["depth"] += 1
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            _state["import_s"] += time.perf_counter() - start
+            _state["depth"] -= 1
+            _patch_savefig()
+
+    return timed_import
+
+
+def _patch_savefig() -> None:
+    """Wrap Figure.savefig once matplotlib has been imported."""
+    figure_module = sys.modules.get("matplotlib.figure")
+    if figure_module is None or getattr(figure_module.Figure.savefig, "_profiled", False):
+        return
+
+    original = figure_module.Figure.savefig
+
+    def savefig(self, *args, **kwargs):
+        # Web exports save again from inside savefig; time only the outer call
+        if _state["saving"]:
+            return original(self, *args, **kwargs)
+
+        _state["saving"] = True
+        start = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            _state["savefig_s"] += time.perf_counter() - start
+            _state["saving"] = False
+
+    savefig._profiled = True
+    figure_module.Figure.savefig = savefig
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ---------------------------------------------------------------------------
+# Profile history
+# ---------------------------------------------------------------------------
+
+def save_profile_run(charts: Dict[str, Dict]) -> None:
+    """Append a profiled build to the history file.
+
+    Args:
+        charts: Mapping of chart script path (relative) to its profile
+    """
+    runs = load_profile_runs()
+    runs.append({"timestamp": datetime.now().isoformat(), "charts": charts})
+    profile_path = _profile_path()
+    profile_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(profile_path, "w", encoding="utf-8") as f:
+        json.dump({"runs": runs[-MAX_RUNS:]}, f, indent=2)
+
+
+def load_profile_runs() -> List[Dict]:
+    """Load profiled builds, oldest first."""
+    profile_path = _profile_path()
+    if not profile_path.exists():
+        return []
+    try:
+        with open(profile_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("runs", [])
+    except (json.JSONDecodeError, OSError):
+        return []
+
+
+def _profile_path() -> Path:
+    # Imported lazily: the bootstrap runs without infrastructure on sys.path
+    from utils.build_cache import CACHE_ROOT
+    return CACHE_ROOT / PROFILE_FILE
@@ -0,0 +1,57 @@
+"""Chart runner - bootstrap that runs a chart.py script with web exports.
+
+    python chart_runner.py path/to/chart.py [profile.json]
+
+The script runs as ``__main__`` exactly as it would directly, except that
+``chart_style.install_web_export`` is active, so a ``plt.savefig`` of
+``chart.pdf`` also writes the web formats next to it. With a second
+argument the script runs under chart_profiler and its timings are
+written there as JSON, including on failure.
+"""
+import runpy
+import sys
+from pathlib import Path
+
+import chart_profiler
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent.parent / "templates"
+
+
+def install_web_export() -> None:
+    """Install chart_style's savefig hook if chart_style is importable."""
+    if str(TEMPLATES_DIR) not in sys.path:
+        sys.path.append(str(TEMPLATES_DIR))
+    try:
+        import chart_style
+    except ImportError:
+        return
+    chart_style.install_web_export()
+
+
+def _main(script: str, profile_output: str = None) -> int:
+    """Run *script* as __main__, profiling it into *profile_output* if given."""
+    script_path = Path(script).resolve()
+    sys.argv = [str(script_path)]
+    sys.path[0] = str(script_path.parent)
+
+    returncode = 0
+    if profile_output:
+        chart_profiler.install()
+    try:
+        install_web_export()
+        runpy.run_path(str(script_path), run_name="__main__")
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            returncode = e.code
+        elif e.code is not None:
+            print(e.code, file=sys.stderr)
+            returncode = 1
+    finally:
+        if profile_output:
+            chart_profiler.write_snapshot(profile_output)
+
+    return returncode
+
+
+if __name__ == "__main__":
+    sys.exit(_main(*sys.argv[1:3]))
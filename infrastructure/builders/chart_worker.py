@@ -0,0 +1,321 @@
+"""Warm chart worker - runs chart.py scripts in a long-lived interpreter.
+
+Starting a fresh interpreter per chart re-imports numpy, matplotlib,
+sklearn and chart_style every time. A worker imports them once and then
+executes each script with runpy in its own namespace, resetting pyplot,
+rcParams and RNG state in between. Workers are recycled after a number of
+scripts or when their memory grows past a limit, so state leaked by a
+script cannot accumulate. An optional hard memory cap is applied to the
+worker process itself.
+"""
+import io
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import warnings
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+TEMPLATES_DIR = PROJECT_ROOT / "templates"
+
+# Modules imported once per worker
+PRELOAD_MODULES = [
+    "numpy",
+    "matplotlib",
+    "matplotlib.pyplot",
+    "scipy",
+    "pandas",
+    "sklearn",
+    "chart_style",
+]
+
+DEFAULT_MAX_SCRIPTS = 25
+DEFAULT_MAX_RSS_MB = 1500
+
+
+class ChartWorker:
+    """A recyclable worker process that runs chart scripts.
+
+    ``run()`` mirrors ``subprocess.run`` so callers can use either one.
+    """
+
+    def __init__(
+        self,
+        max_scripts: int = DEFAULT_MAX_SCRIPTS,
+        max_rss_mb: float = DEFAULT_MAX_RSS_MB,
+        memory_limit_mb: float = 0,
+        env: dict = None
+    ):
+        self.max_scripts = max_scripts
+        self.max_rss_mb = max_rss_mb
+        self.memory_limit_mb = memory_limit_mb
+        self.env = env or {}
+        self._ctx = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._scripts_run = 0
+
+    def run(
+        self,
+        script_path: Path,
+        timeout: float = 120,
+        profile: bool = False
+    ) -> subprocess.CompletedProcess:
+        """Run *script_path* in the worker.
+
+        With *profile*, the returned object carries a ``profile`` dict of
+        chart_profiler timings (``peak_rss_mb`` is the worker's peak so far).
+
+        Raises:
+            subprocess.TimeoutExpired: If the script exceeds *timeout*
+        """
+        script_path = Path(script_path).resolve()
+        if self._process is None or not self._process.is_alive():
+            self._start()
+
+        self._conn.send((str(script_path), profile))
+        if not self._conn.poll(timeout):
+            self._stop(graceful=False)
+            raise subprocess.TimeoutExpired([str(script_path)], timeout)
+
+        try:
+            returncode, stdout, stderr, rss_mb, timings = self._conn.recv()
+        except EOFError:
+            # Keep the exit code so a worker killed by a signal is recognisable
+            self._process.join(timeout=5)
+            exitcode = self._process.exitcode
+            self._stop(graceful=False)
+            return subprocess.CompletedProcess(
+                [str(script_path)], exitcode or 1, "", "Chart worker exited unexpectedly"
+            )
+
+        self._scripts_run += 1
+        if self._scripts_run >= self.max_scripts or rss_mb > self.max_rss_mb:
+            self._stop()
+
+        result = subprocess.CompletedProcess([str(script_path)], returncode, stdout, stderr)
+        result.profile = timings
+        return result
+
+    def close(self) -> None:
+        """Shut the worker down."""
+        self._stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start(self) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_serve, args=(child_conn, self.memory_limit_mb, self.env), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        self._process = process
+        self._conn = parent_conn
+        self._scripts_run = 0
+
+    def _stop(self, graceful: bool = True) -> None:
+        if self._process is None:
+            return
+        if graceful and self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+
+class ChartWorkerPool:
+    """One ChartWorker per calling thread, for use with thread pools."""
+
+    def __init__(
+        self,
+        max_scripts: int = DEFAULT_MAX_SCRIPTS,
+        max_rss_mb: float = DEFAULT_MAX_RSS_MB,
+        memory_limit_mb: float = 0,
+        env: dict = None
+    ):
+        self.max_scripts = max_scripts
+        self.max_rss_mb = max_rss_mb
+        self.memory_limit_mb = memory_limit_mb
+        self.env = env or {}
+        self._local = threading.local()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        script_path: Path,
+        timeout: float = 120,
+        profile: bool = False
+    ) -> subprocess.CompletedProcess:
+        """Run *script_path* on the current thread's worker."""
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            worker = ChartWorker(self.max_scripts, self.max_rss_mb, self.memory_limit_mb, self.env)
+            self._local.worker = worker
+            with self._lock:
+                self._workers.append(worker)
+        return worker.run(script_path, timeout, profile)
+
+    def close(self) -> None:
+        """Shut down every worker."""
+        with self._lock:
+            for worker in self._workers:
+                worker.close()
+            self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+def _serve(conn, memory_limit_mb: float = 0, env: dict = None) -> None:
+    """Worker main loop: receive script paths, send back results.
+
+    *env* holds environment overrides, applied before chart_style is
+    preloaded so settings it reads at import take effect.
+    """
+    if memory_limit_mb:
+        from utils.job_limits import apply_memory_limit
+        apply_memory_limit(memory_limit_mb)
+
+    os.environ.update(env or {})
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    sys.path.insert(0, str(TEMPLATES_DIR))
+
+    for name in PRELOAD_MODULES:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+    # Scripts that plt.savefig a chart.pdf get the web exports as well
+    if "chart_style" in sys.modules:
+        sys.modules["chart_style"].install_web_export()
+
+    baseline = {
+        "path": list(sys.path),
+        "argv": list(sys.argv),
+        "cwd": os.getcwd(),
+        "modules": set(sys.modules),
+        "warnings": list(warnings.filters),
+    }
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+
+        script, profile = message
+        timings = None
+        if profile:
+            from builders import chart_profiler
+            chart_profiler.install()
+
+        returncode, stdout, stderr = _run_script(Path(script))
+        if profile:
+            timings = chart_profiler.snapshot()
+        _reset_state(baseline)
+        conn.send((returncode, stdout, stderr, _current_rss_mb(), timings))
+
+    conn.close()
+
+
+def _run_script(script_path: Path) -> tuple:
+    """Execute one chart script as ``__main__`` with captured output."""
+    import runpy
+    import traceback
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    returncode = 0
+
+    os.chdir(script_path.parent)
+    sys.argv = [str(script_path)]
+    sys.path.insert(0, str(script_path.parent))
+
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            runpy.run_path(str(script_path), run_name="__main__")
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                returncode = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+
+    return returncode, stdout.getvalue(), stderr.getvalue()
+
+
+def _reset_state(baseline: dict) -> None:
+    """Undo the global state a chart script may have changed."""
+    import gc
+    import random
+
+    sys.path[:] = baseline["path"]
+    sys.argv[:] = baseline["argv"]
+    os.chdir(baseline["cwd"])
+    warnings.filters[:] = baseline["warnings"]
+
+    # Forget project modules imported by the script (helpers next to chart.py)
+    project_root = str(PROJECT_ROOT)
+    for name in set(sys.modules) - baseline["modules"]:
+        module_file = getattr(sys.modules[name], "__file__", None) or ""
+        if module_file.startswith(project_root):
+            del sys.modules[name]
+
+    if "matplotlib.pyplot" in sys.modules:
+        import matplotlib
+        import matplotlib.pyplot as plt
+        plt.close("all")
+        matplotlib.rc_file_defaults()
+
+    if "numpy" in sys.modules:
+        import numpy as np
+        np.random.seed()
+    random.seed()
+
+    gc.collect()
+
+
+def _current_rss_mb() -> float:
+    """Resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return 0.0
@@ -0,0 +1,205 @@
+"""Deck dependency scanning and up-to-date checks.
+
+A deck's build key covers its source, every file it pulls in through
+``\\includegraphics``, ``\\input`` or ``\\include`` (followed recursively)
+and the pdflatex version. A deck whose PDF was built from the current key
+does not need compiling again, and the diagnostics of that compile can be
+reused by validation. Frames are located in the source so previews and
+log diagnostics can refer to them by number.
+"""
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.build_cache import CACHE_ROOT
+from utils.hash_utils import compute_file_hash, compute_string_hash
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+STATE_FILE = "deck_state.json"
+
+GRAPHICS_PATTERN = re.compile(r"\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}")
+INPUT_PATTERN = re.compile(r"\\(?:input|include)\s*\{([^}]+)\}")
+COMMENT_PATTERN = re.compile(r"(?<!\\)%.*")
+FRAME_BEGIN = re.compile(r"^[ \t]*\\begin\{frame\}", re.MULTILINE)
+FRAME_END = re.compile(r"\\end\{frame\}")
+SECTION_PATTERN = re.compile(r"^[ \t]*\\(section|subsection)\*?\s*(?:\[[^\]]*\])?\s*\{", re.MULTILINE)
+
+# Extensions tried, in order, when a reference omits one
+GRAPHICS_EXTENSIONS = ["", ".pdf", ".png", ".jpg", ".jpeg"]
+INPUT_EXTENSIONS = ["", ".tex"]
+
+
+def scan_dependencies(tex_path: Path) -> List[Path]:
+    """Files a deck includes, resolved against the deck's directory.
+
+    References that cannot be resolved are returned as the path written
+    in the source, so they count as missing in the build key.
+    """
+    base = tex_path.parent
+    deps = []
+    seen = set()
+    pending = [tex_path]
+
+    while pending:
+        source = pending.pop()
+        text = COMMENT_PATTERN.sub("", source.read_text(encoding="utf-8", errors="ignore"))
+
+        for ref in GRAPHICS_PATTERN.findall(text):
+            dep = _resolve(base, ref.strip(), GRAPHICS_EXTENSIONS)
+            if dep not in seen:
+                seen.add(dep)
+                deps.append(dep)
+
+        for ref in INPUT_PATTERN.findall(text):
+            dep = _resolve(base, ref.strip(), INPUT_EXTENSIONS)
+            if dep not in seen:
+                seen.add(dep)
+                deps.append(dep)
+                if dep.suffix == ".tex" and dep.exists():
+                    pending.append(dep)
+
+    return deps
+
+
+def find_frames(source: str, body_start: int = 0) -> List[dict]:
+    """Frame environments of a deck with their number, title, span and section.
+
+    Returns:
+        List of dicts with number (1-based), title, start, end and the
+        ``\\section``/``\\subsection`` commands in force at the frame
+    """
+    frames = []
+    sections = {"section": "", "subsection": ""}
+    pos = body_start
+    for match in FRAME_BEGIN.finditer(source, body_start):
+        if match.start() < pos:
+            continue
+        for section in SECTION_PATTERN.finditer(source, pos, match.start()):
+            command = source[section.start():_closing_brace(source, section.end() - 1) + 1].strip()
+            sections[section.group(1)] = command
+            if section.group(1) == "section":
+                sections["subsection"] = ""
+
+        end = FRAME_END.search(source, match.end())
+        if end is None:
+            break
+        pos = end.end()
+        frames.append({
+            "number": len(frames) + 1,
+            "title": _frame_title(source[match.end():pos]),
+            "start": match.start(),
+            "end": pos,
+            "section": "\n".join(s for s in (sections["section"], sections["subsection"]) if s),
+        })
+    return frames
+
+
+def deck_key(tex_path: Path, deps: List[Path], toolchain: str = "") -> str:
+    """Build key for a deck: its source, its dependencies and the toolchain."""
+    parts = [f"tex:{compute_file_hash(tex_path)}", f"toolchain:{toolchain}"]
+    for dep in deps:
+        name = os.path.relpath(dep, tex_path.parent)
+        parts.append(f"{name}:{compute_file_hash(dep) if dep.is_file() else 'missing'}")
+    return compute_string_hash("\n".join(parts))
+
+
+class DeckState:
+    """Build keys and compile outcomes of the decks last compiled.
+
+    Failed compiles can be remembered too, so a deck that failed on an
+    error in its source is not compiled again until one of its inputs
+    changes. CompileService decides which failures are worth recording.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or CACHE_ROOT / STATE_FILE)
+        self._decks: Dict[str, Dict] = self._load()
+
+    def lookup(self, tex_path: Path, key: str) -> Optional[Dict]:
+        """Outcome of compiling the deck from *key*, if still valid.
+
+        Returns:
+            Dict with passed and the compile diagnostics, or None
+        """
+        entry = self._decks.get(_rel(tex_path))
+        if not entry or entry.get("key") != key:
+            return None
+        if not entry.get("passed", True):
+            return entry
+        pdf_path = tex_path.with_suffix(".pdf")
+        if not pdf_path.exists():
+            return None
+        stat = pdf_path.stat()
+        # A PDF replaced by hand or by another tool no longer matches
+        if entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+            return entry
+        return None
+
+    def is_current(self, tex_path: Path, key: str) -> bool:
+        """Whether the deck's PDF exists and was built from *key*."""
+        entry = self.lookup(tex_path, key)
+        return bool(entry and entry.get("passed", True))
+
+    def record(self, tex_path: Path, key: str, passed: bool = True, diagnostics: Dict = None) -> None:
+        """Remember the outcome of compiling the deck from *key*."""
+        entry = {"key": key, "passed": passed}
+        if passed:
+            stat = tex_path.with_suffix(".pdf").stat()
+            entry.update(size=stat.st_size, mtime=stat.st_mtime)
+        entry.update(diagnostics or {})
+        self._decks[_rel(tex_path)] = entry
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"decks": self._decks}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("decks", {})
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+
+def _resolve(base: Path, ref: str, extensions: List[str]) -> Path:
+    for ext in extensions:
+        candidate = base / f"{ref}{ext}"
+        if candidate.is_file():
+            return candidate
+    return base / ref
+
+
+def _rel(tex_path: Path) -> str:
+    return tex_path.resolve().relative_to(PROJECT_ROOT.resolve()).as_posix()
+
+
+def _frame_title(frame: str) -> str:
+    """Title given as ``\\begin{frame}[opts]{Title}`` or ``\\frametitle{Title}``."""
+    match = re.match(r"\s*(?:<[^>]*>)?\s*(?:\[[^\]]*\])?\s*(?:<[^>]*>)?\s*\{", frame)
+    if match is None:
+        match = re.search(r"\\frametitle\s*(?:<[^>]*>)?\s*(?:\[[^\]]*\])?\s*\{", frame)
+    if match is None:
+        return ""
+    end = _closing_brace(frame, match.end() - 1)
+    return " ".join(frame[match.end():end].split())
+
+
+def _closing_brace(text: str, open_pos: int) -> int:
+    """Index of the brace closing the one at *open_pos* (end of text if unbalanced)."""
+    depth = 0
+    for i in range(open_pos, len(text)):
+        char = text[i]
+        if char == "{" and text[i - 1] != "\\":
+            depth += 1
+        elif char == "}" and text[i - 1] != "\\":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(text) - 1
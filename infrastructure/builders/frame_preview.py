@@ -0,0 +1,153 @@
+"""Fast previews of selected frames of a deck.
+
+The deck is cut down to its preamble, title block and the requested
+frames (each with the \\section/\\subsection it sits under) and compiled
+once against the deck's precompiled preamble format. The preview PDF is
+written to ``preview/`` in the deck's output directory (outside the
+source tree) and never replaces the deck PDF.
+"""
+import subprocess
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from utils.job_limits import MAX_RSS_MB, crash_signal, exceeded_memory, limited_command
+
+from .deck_deps import find_frames
+from .latex_format import FORMAT_NAME, FormatCache, format_env
+from .slide_builder import deck_output_dir
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+PREVIEW_TIMEOUT = 60
+
+
+def preview_frames(
+    tex_path: Path,
+    frames: str = None,
+    title: str = None,
+    verbose: bool = False,
+    use_format: bool = True,
+    max_rss_mb: float = None
+) -> Optional[Path]:
+    """Compile a throwaway PDF of some frames of a deck.
+
+    Args:
+        tex_path: Deck source
+        frames: Frame numbers, counted as ``\\begin{frame}`` environments in
+            the source from 1 (e.g. "7", "3,5-7")
+        title: Case-insensitive text matched against frame titles
+        verbose: Show pdflatex output
+        use_format: Compile against the cached preamble format
+        max_rss_mb: Address-space cap for pdflatex in MB (None for
+            COURSE_MAX_RSS_MB, off by default; 0 to disable)
+
+    Returns:
+        Path of the preview PDF, or None if it could not be built
+    """
+    max_rss_mb = MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+    source = tex_path.read_text(encoding="utf-8", errors="ignore")
+    begin = source.find("\\begin{document}")
+    if begin < 0:
+        print(f"  [FAIL] {tex_path.name} has no \\begin{{document}}")
+        return None
+    begin += len("\\begin{document}")
+
+    all_frames = find_frames(source, begin)
+    selected = _select(all_frames, frames, title)
+    if not selected:
+        print(f"  [FAIL] No matching frames in {tex_path.name} ({len(all_frames)} frames)")
+        return None
+
+    # Each frame keeps the section it sits under, for headers and navigation
+    parts = [source[:begin]]
+    current = None
+    for frame in selected:
+        if frame["section"] and frame["section"] != current:
+            parts.append(frame["section"])
+            current = frame["section"]
+        parts.append(source[frame["start"]:frame["end"]])
+    parts.append("\\end{document}\n")
+    preview = "\n".join(parts)
+
+    out_dir = deck_output_dir(tex_path) / "preview"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobname = f"{tex_path.stem}_preview"
+    pdf_path = out_dir / f"{jobname}.pdf"
+    if pdf_path.exists():
+        pdf_path.unlink()
+
+    numbers = ", ".join(str(f["number"]) for f in selected)
+    print(f"  Previewing {tex_path.name} frame{'s' if len(selected) > 1 else ''} {numbers}...")
+    start = time.perf_counter()
+
+    command = ["pdflatex", "-interaction=nonstopmode", f"-output-directory={out_dir}", f"-jobname={jobname}"]
+    prepared = FormatCache().prepare(tex_path, out_dir, source=preview) if use_format else None
+    note = ""
+    try:
+        if prepared:
+            derived, fmt_path = prepared
+            result = _run(command + [f"-fmt={FORMAT_NAME}", derived.as_posix()],
+                          tex_path.parent, max_rss_mb, format_env(fmt_path))
+            note = ", preamble format"
+        if not prepared or (result.returncode != 0 and not pdf_path.exists()):
+            plain = out_dir / f"{jobname}.tex"
+            plain.write_text(preview, encoding="utf-8")
+            result = _run(command + [plain.as_posix()], tex_path.parent, max_rss_mb)
+            note = ""
+    except FileNotFoundError:
+        print(f"    [FAIL] pdflatex not found")
+        return None
+    except subprocess.TimeoutExpired:
+        print(f"    [KILLED] Exceeded time limit ({PREVIEW_TIMEOUT}s)")
+        return None
+
+    if verbose:
+        print(result.stdout)
+    if max_rss_mb and exceeded_memory(result.returncode, result.stderr):
+        print(f"    [KILLED] Exceeded memory limit ({max_rss_mb:.0f} MB)")
+        return None
+    if crash_signal(result.returncode):
+        print(f"    [FAIL] pdflatex crashed ({crash_signal(result.returncode)})")
+        return None
+    if not pdf_path.exists():
+        print(f"    [FAIL] PDF not created (see {(out_dir / jobname).with_suffix('.log')})")
+        return None
+
+    # pdflatex exits nonzero on recoverable errors; the page is still
+    # worth looking at, so warn instead of failing
+    status = "PASS" if result.returncode == 0 else "WARN"
+    elapsed = time.perf_counter() - start
+    print(f"    [{status}] {pdf_path} ({elapsed:.1f}s{note})")
+    return pdf_path
+
+
+def _select(frames: List[dict], spec: str = None, title: str = None) -> List[dict]:
+    """Frames matching a number spec ("3,5-7") and/or a title substring."""
+    wanted = set()
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        low, _, high = part.partition("-")
+        try:
+            wanted.update(range(int(low), int(high or low) + 1))
+        except ValueError:
+            print(f"  [WARN] Ignoring frame spec '{part}'")
+    needle = title.lower() if title else None
+    return [
+        f for f in frames
+        if f["number"] in wanted or (needle and needle in f["title"].lower())
+    ]
+
+
+def _run(command: list, cwd: Path, max_rss_mb: float, env: dict = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        limited_command(command, max_rss_mb),
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        errors="replace",
+        timeout=PREVIEW_TIMEOUT
+    )
@@ -0,0 +1,152 @@
+"""Precompiled preamble formats (mylatexformat) for deck compilation.
+
+Decks carry a copy of the course Beamer preamble. Loading beamer, tikz
+and the theme dominates the cost of a pass, so the preamble of each deck
+(everything before the first ``\\title``) is dumped once into a ``.fmt``
+with mylatexformat and decks are compiled against it. Formats are keyed
+on the preamble text, template_beamer_final.tex and the pdflatex
+version, so editing either rebuilds them. Any failure means the caller
+compiles the deck normally.
+"""
+import os
+import re
+import subprocess
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from utils.build_cache import BuildCache
+from utils.hash_utils import compute_file_hash, compute_string_hash
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+TEMPLATE_PATH = PROJECT_ROOT / "template_beamer_final.tex"
+
+FORMAT_NAME = "preamble"
+END_OF_DUMP = "\\endofdump"
+
+
+class FormatCache:
+    """Dump and reuse one preamble format per distinct deck preamble.
+
+    Safe to share between threads: each format is dumped once, and decks
+    that need it meanwhile wait for that dump.
+    """
+
+    def __init__(self, cache: Optional[BuildCache] = None):
+        self.cache = cache or BuildCache("latex_fmt")
+        self._locks: Dict[str, threading.Lock] = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    def prepare(
+        self,
+        tex_path: Path,
+        out_dir: Path,
+        source: str = None
+    ) -> Optional[Tuple[Path, Path]]:
+        """Write the format-ready source for *tex_path* and make sure its format exists.
+
+        Args:
+            tex_path: Deck source
+            out_dir: Deck output directory (receives the derived source)
+            source: Text to use instead of the deck's own (e.g. a cut-down
+                preview); its preamble decides the format
+
+        Returns:
+            (derived source, format file), or None to compile normally
+        """
+        if source is None:
+            source = tex_path.read_text(encoding="utf-8", errors="ignore")
+        split = split_preamble(source)
+        if split is None:
+            return None
+
+        preamble, body = split
+        key = compute_string_hash("\n".join([
+            preamble, _template_hash(), pdflatex_version()
+        ]))
+
+        derived = out_dir / f"{tex_path.stem}.fmt.tex"
+        derived.write_text(f"{preamble}{END_OF_DUMP}\n{body}", encoding="utf-8")
+
+        fmt_path = self._ensure_format(key, derived, tex_path.parent)
+        return (derived, fmt_path) if fmt_path else None
+
+    def _ensure_format(self, key: str, derived: Path, cwd: Path) -> Optional[Path]:
+        with self._lock:
+            if key in self._failed:
+                return None
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            cached = self.cache.lookup(key, f"{FORMAT_NAME}.fmt")
+            if cached:
+                return cached
+            if key in self._failed:
+                return None
+
+            fmt_path = self._dump(key, derived, cwd)
+            if fmt_path is None:
+                with self._lock:
+                    self._failed.add(key)
+            return fmt_path
+
+    def _dump(self, key: str, derived: Path, cwd: Path) -> Optional[Path]:
+        """Run pdflatex -ini with mylatexformat up to the \\endofdump marker."""
+        with tempfile.TemporaryDirectory(prefix="fmt-") as tmp:
+            try:
+                result = subprocess.run(
+                    ["pdflatex", "-ini", "-interaction=nonstopmode",
+                     f"-jobname={FORMAT_NAME}", f"-output-directory={tmp}",
+                     "&pdflatex", "mylatexformat.ltx", str(derived)],
+                    cwd=cwd,
+                    capture_output=True,
+                    text=True,
+                    errors="replace",
+                    timeout=300
+                )
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                return None
+
+            built = Path(tmp) / f"{FORMAT_NAME}.fmt"
+            if result.returncode != 0 or not built.exists():
+                return None
+            return self.cache.store(key, built)
+
+
+def split_preamble(source: str) -> Optional[Tuple[str, str]]:
+    """Split a deck at its first ``\\title`` (or ``\\begin{document}``).
+
+    The shared part is what the decks have in common; title, author and
+    date differ per deck and are left to the normal compile.
+    """
+    begin = source.find("\\begin{document}")
+    if begin < 0 or "\\documentclass" not in source[:begin]:
+        return None
+    title = re.search(r"^\s*\\title\b", source[:begin], re.MULTILINE)
+    cut = title.start() if title else begin
+    return source[:cut], source[cut:]
+
+
+def format_env(fmt_path: Path) -> dict:
+    """Environment letting pdflatex find *fmt_path* with ``-fmt``."""
+    env = dict(os.environ)
+    # Trailing separator keeps kpathsea's default format path
+    env["TEXFORMATS"] = f"{fmt_path.parent}{os.pathsep}{env.get('TEXFORMATS', '')}"
+    return env
+
+
+def _template_hash() -> str:
+    return compute_file_hash(TEMPLATE_PATH) if TEMPLATE_PATH.exists() else "none"
+
+
+@lru_cache(maxsize=None)
+def pdflatex_version() -> str:
+    """First line of ``pdflatex --version`` ('unknown' if unavailable)."""
+    try:
+        result = subprocess.run(["pdflatex", "--version"], capture_output=True, text=True, timeout=30)
+        return result.stdout.splitlines()[0] if result.stdout else "unknown"
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return "unknown"
@@ -0,0 +1,232 @@
+"""Structured diagnostics from pdflatex logs.
+
+The log is read line by line (so large logs are never held in memory) for
+errors, overfull/underfull boxes, missing files and undefined references.
+Each item is mapped to its line in the deck source and the frame it falls
+in (frames numbered in source order, as for ``build slides --frame``).
+The result is written as a JSON index next to the log, so reports can
+read it without compiling or re-parsing.
+"""
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from .deck_deps import find_frames
+from .latex_format import split_preamble
+
+INDEX_SUFFIX = ".diagnostics.json"
+
+# Bump when the index layout changes so old indexes are re-parsed
+INDEX_VERSION = 1
+
+# pdflatex wraps log lines at this width (max_print_line)
+LOG_LINE_WIDTH = 79
+
+BOX_PATTERN = re.compile(
+    r"^(Overfull|Underfull) \\([hv])box \(([^)]*)\) "
+    r"(?:in paragraph at lines (\d+)--(\d+)|in alignment at lines (\d+)--(\d+)|detected at line (\d+))?"
+)
+SOURCE_LINE = re.compile(r"^l\.(\d+)")
+INPUT_LINE = re.compile(r"on input line (\d+)")
+MISSING_FILE = re.compile(r"File `([^']+)' not found")
+UNDEFINED_REF = re.compile(r"(Reference|Citation) `([^']+)' on page \d+ undefined")
+
+# Lines searched after a "! ..." error for its "l.<N>" source line
+ERROR_CONTEXT_LINES = 20
+
+
+def parse_log(log_path: Path) -> Dict:
+    """Diagnostics of a pdflatex log, with line numbers as printed in the log.
+
+    Returns:
+        Dict with the diagnostics list (type, message, line) and whether
+        the log comes from a preamble-format compile
+    """
+    items = []
+    from_format = False
+    pending_error = None
+
+    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in _logical_lines(f):
+            if ".fmt.tex" in line:
+                from_format = True
+
+            if pending_error is not None:
+                match = SOURCE_LINE.match(line)
+                if match:
+                    pending_error["line"] = int(match.group(1))
+                    pending_error = None
+                    continue
+                pending_error["_budget"] -= 1
+                if pending_error["_budget"] <= 0:
+                    pending_error = None
+
+            if line.startswith("! "):
+                pending_error = {"type": "error", "message": line[2:].strip(), "line": None,
+                                 "_budget": ERROR_CONTEXT_LINES}
+                items.append(pending_error)
+                missing = MISSING_FILE.search(line)
+                if missing:
+                    items.append({"type": "missing_file", "message": missing.group(1), "line": None})
+                continue
+
+            box = BOX_PATTERN.match(line)
+            if box:
+                numbers = [int(g) for g in box.groups()[3:] if g]
+                items.append({
+                    "type": box.group(1).lower(),
+                    "message": f"{box.group(1)} \\{box.group(2)}box ({box.group(3)})",
+                    "line": numbers[0] if numbers else None,
+                })
+                continue
+
+            if "Warning" in line:
+                missing = MISSING_FILE.search(line)
+                undefined = UNDEFINED_REF.search(line)
+                source_line = INPUT_LINE.search(line)
+                if missing:
+                    items.append({"type": "missing_file", "message": missing.group(1),
+                                  "line": int(source_line.group(1)) if source_line else None})
+                elif undefined:
+                    items.append({"type": "undefined_reference",
+                                  "message": f"{undefined.group(1)} `{undefined.group(2)}' undefined",
+                                  "line": int(source_line.group(1)) if source_line else None})
+
+    for item in items:
+        item.pop("_budget", None)
+    items = _dedupe_missing(items)
+    return {"items": items, "from_format": from_format}
+
+
+def write_diagnostics(tex_path: Path, log_path: Path) -> Dict:
+    """Parse *log_path*, map items to source lines and frames, and save the index.
+
+    Line numbers are taken to refer to the deck itself; decks do not
+    ``\\input`` other sources.
+
+    Returns:
+        The index: per-type counts and the diagnostics with frame numbers
+    """
+    parsed = parse_log(log_path)
+    source = tex_path.read_text(encoding="utf-8", errors="ignore")
+
+    # The format-ready source has \endofdump inserted after the preamble
+    shift_after = None
+    if parsed["from_format"]:
+        split = split_preamble(source)
+        if split:
+            shift_after = split[0].count("\n") + 1
+
+    body = source.find("\\begin{document}")
+    frames = [
+        {
+            "number": f["number"],
+            "title": f["title"],
+            "first": source.count("\n", 0, f["start"]) + 1,
+            "last": source.count("\n", 0, f["end"]) + 1,
+        }
+        for f in find_frames(source, max(body, 0))
+    ]
+
+    diagnostics = []
+    for item in parsed["items"]:
+        line = item["line"]
+        if line is not None and shift_after is not None and line > shift_after:
+            line -= 1
+        frame = _frame_at(frames, line)
+        diagnostics.append({
+            **item,
+            "line": line,
+            "frame": frame["number"] if frame else None,
+            "frame_title": frame["title"] if frame else None,
+        })
+
+    counts = {}
+    for item in diagnostics:
+        counts[item["type"]] = counts.get(item["type"], 0) + 1
+
+    index = {
+        "version": INDEX_VERSION,
+        "tex": tex_path.name,
+        "log_mtime": log_path.stat().st_mtime,
+        "counts": counts,
+        "diagnostics": diagnostics,
+    }
+    index_path = diagnostics_path(log_path)
+    tmp = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp, index_path)
+    return index
+
+
+def load_diagnostics(tex_path: Path, log_path: Path) -> Optional[Dict]:
+    """The diagnostics index for a deck's log, re-parsing the log if the index is stale.
+
+    Returns:
+        The index, or None if there is no log
+    """
+    if not log_path.exists():
+        return None
+    index_path = diagnostics_path(log_path)
+    if index_path.exists():
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION and index.get("log_mtime") == log_path.stat().st_mtime:
+                return index
+        except (json.JSONDecodeError, OSError):
+            pass
+    return write_diagnostics(tex_path, log_path)
+
+
+def diagnostics_path(log_path: Path) -> Path:
+    """Where the diagnostics index for *log_path* is kept."""
+    return log_path.with_name(f"{log_path.stem}{INDEX_SUFFIX}")
+
+
+def _logical_lines(f: TextIO) -> Iterator[str]:
+    """Log lines with pdflatex's hard wrapping at 79 characters undone."""
+    buffer = ""
+    for raw in f:
+        line = raw.rstrip("\n")
+        if len(line) == LOG_LINE_WIDTH:
+            buffer += line
+            continue
+        yield buffer + line
+        buffer = ""
+    if buffer:
+        yield buffer
+
+
+def _frame_at(frames: List[Dict], line: Optional[int]) -> Optional[Dict]:
+    if line is None:
+        return None
+    for frame in frames:
+        if frame["first"] <= line <= frame["last"]:
+            return frame
+    return None
+
+
+def _dedupe_missing(items: List[Dict]) -> List[Dict]:
+    """Merge repeated missing-file reports, keeping the first known source line."""
+    first = {}
+    result = []
+    error_line = None
+    for item in items:
+        if item["type"] == "error":
+            error_line = item["line"]
+        elif item["type"] == "missing_file":
+            # Reported with the error just before it
+            if item["line"] is None:
+                item["line"] = error_line
+            if item["message"] in first:
+                kept = first[item["message"]]
+                if kept["line"] is None:
+                    kept["line"] = item["line"]
+                continue
+            first[item["message"]] = item
+        result.append(item)
+    return result
@@ -0,0 +1,231 @@
+"""Web-optimized copies of deck PDFs for docs/slides/pdf.
+
+Deck PDFs embed every chart PDF they include, each with its own font
+subsets, so the same chart or font is often stored several times. Before
+publishing, identical embedded XObjects and fonts are merged, streams are
+recompressed into object streams and the file is linearized so browsers
+can show the first page before the rest arrives.
+
+pikepdf does the full job; without it the qpdf command line is used
+(recompression and linearization only). With neither, PDFs are copied
+unchanged. Optimized files are cached by source hash, so unchanged decks
+are not processed again.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.build_cache import BuildCache, atomic_copy
+from utils.hash_utils import compute_file_hash, compute_pdf_object_hash, compute_string_hash
+
+from .slide_builder import get_topic_dir, find_decks
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+WEB_PDF_DIR = PROJECT_ROOT / "docs" / "slides" / "pdf"
+
+# Bump when the optimization steps change so cached results are redone
+OPTIMIZER_VERSION = 1
+
+# Resource categories whose entries are merged when identical
+DEDUPE_RESOURCES = ["/XObject", "/Font"]
+
+
+def publish_pdfs(
+    manifest: dict,
+    topic: str = None,
+    jobs: int = None,
+    force: bool = False
+) -> bool:
+    """
+    Write web-optimized copies of the published deck PDFs to docs/slides/pdf.
+
+    Only decks that already have a copy in docs/slides/pdf are published.
+
+    Args:
+        manifest: Course manifest
+        topic: Topic ID to publish (None for all)
+        jobs: Number of PDFs processed concurrently (None for CPU count)
+        force: Optimize again even if a cached result exists
+
+    Returns:
+        True if every PDF was published
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    topics = manifest["topics"]
+    if topic:
+        topics = [t for t in topics if t["id"] == topic]
+
+    decks = []
+    for t in topics:
+        topic_dir = get_topic_dir(t)
+        if topic_dir.exists():
+            decks.extend(d for d in find_decks(topic_dir) if (WEB_PDF_DIR / f"{d.stem}.pdf").exists())
+
+    print(f"\n  Publishing {len(decks)} deck PDFs ({optimizer_name() or 'no optimizer, copying'})...")
+    cache = BuildCache("web_pdf")
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(optimize_pdf, d.with_suffix(".pdf"), WEB_PDF_DIR / f"{d.stem}.pdf", cache, force)
+            for d in decks
+        ]
+        results = [f.result() for f in futures]
+
+    for result in results:
+        for line in result["lines"]:
+            print(line)
+
+    passed = [r for r in results if r["passed"]]
+    before = sum(r["before"] for r in passed)
+    after = sum(r["after"] for r in passed)
+    if passed:
+        print(f"\n  PDFs: {len(passed)}/{len(results)} published, "
+              f"{_mb(before)} -> {_mb(after)} (saved {_mb(before - after)})")
+    return len(passed) == len(results)
+
+
+def optimize_pdf(
+    src: Path,
+    dest: Path,
+    cache: Optional[BuildCache] = None,
+    force: bool = False
+) -> Dict:
+    """Write an optimized copy of *src* to *dest* (atomically).
+
+    Returns:
+        Dict with passed, before/after sizes in bytes, the tool used,
+        whether the result came from the cache and the output lines
+    """
+    result = {"name": src.name, "passed": False, "before": 0, "after": 0,
+              "tool": None, "cached": False, "lines": []}
+    if not src.exists():
+        result["lines"].append(f"    [FAIL] {src.name} not built")
+        return result
+
+    cache = cache or BuildCache("web_pdf")
+    tool = optimizer_name()
+    key = compute_string_hash(f"{compute_file_hash(src)}\n{tool}\n{OPTIMIZER_VERSION}")
+    result["before"] = src.stat().st_size
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    if not force and cache.restore(key, dest, "web.pdf"):
+        result.update(passed=True, after=dest.stat().st_size, tool=tool, cached=True)
+        result["lines"].append(f"    [CACHED] {src.name} ({_saving(result)})")
+        return result
+
+    with tempfile.TemporaryDirectory(prefix="webpdf-") as tmp:
+        optimized = Path(tmp) / "web.pdf"
+        try:
+            tool = _optimize(src, optimized)
+        except Exception as e:
+            result["lines"].append(f"    [WARN] {src.name}: optimization failed ({e}), copying unchanged")
+            tool = None
+        if tool is None:
+            shutil.copyfile(src, optimized)
+        cache.store(key, optimized)
+        atomic_copy(optimized, dest)
+
+    result.update(passed=True, after=dest.stat().st_size, tool=tool)
+    result["lines"].append(f"    [PASS] {src.name} ({_saving(result)}{', ' + tool if tool else ''})")
+    return result
+
+
+@lru_cache(maxsize=None)
+def optimizer_name() -> Optional[str]:
+    """The available optimizer: 'pikepdf', 'qpdf' or None."""
+    try:
+        import pikepdf  # noqa: F401
+        return "pikepdf"
+    except ImportError:
+        pass
+    return "qpdf" if shutil.which("qpdf") else None
+
+
+def _optimize(src: Path, dest: Path) -> Optional[str]:
+    """Optimize *src* into *dest* with the available tool; returns its name (None if none)."""
+    tool = optimizer_name()
+    if tool == "pikepdf":
+        import pikepdf
+        with pikepdf.open(src) as pdf:
+            _dedupe_resources(pdf)
+            pdf.save(
+                dest,
+                linearize=True,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                compress_streams=True,
+                recompress_flate=True,
+            )
+        return tool
+
+    if tool == "qpdf":
+        result = subprocess.run(
+            ["qpdf", "--linearize", "--object-streams=generate", "--compress-streams=y",
+             "--recompress-flate", str(src), str(dest)],
+            capture_output=True,
+            text=True,
+            timeout=300
+        )
+        # Exit code 3 means the output was written with warnings
+        if result.returncode not in (0, 3):
+            raise RuntimeError(result.stderr.strip() or f"qpdf exited with {result.returncode}")
+        return tool
+
+    return None
+
+
+def _dedupe_resources(pdf) -> int:
+    """Point identical XObjects and fonts in resource dictionaries at one copy.
+
+    Resources of form XObjects (the embedded chart PDFs) are visited too.
+    Objects no longer referenced are dropped when the PDF is saved.
+
+    Returns:
+        Number of references replaced
+    """
+    canonical = {}
+    fingerprints = {}
+    visited = set()
+    replaced = 0
+    pending = [page.obj.get("/Resources") for page in pdf.pages]
+
+    while pending:
+        resources = pending.pop()
+        if resources is None or not hasattr(resources, "keys"):
+            continue
+        if resources.is_indirect:
+            if resources.objgen in visited:
+                continue
+            visited.add(resources.objgen)
+
+        for category in DEDUPE_RESOURCES:
+            entries = resources.get(category)
+            if entries is None:
+                continue
+            for name in list(entries.keys()):
+                obj = entries[name]
+                if not obj.is_indirect:
+                    continue
+                key = compute_pdf_object_hash(obj, fingerprints)
+                first = canonical.setdefault(key, obj)
+                if first.objgen != obj.objgen:
+                    entries[name] = first
+                    replaced += 1
+                    obj = first
+                if category == "/XObject" and "/Resources" in obj:
+                    pending.append(obj.get("/Resources"))
+
+    return replaced
+
+
+def _saving(result: Dict) -> str:
+    before, after = result["before"], result["after"]
+    percent = 100 * (before - after) / before if before else 0
+    return f"{_mb(before)} -> {_mb(after)}, {percent:.1f}% saved"
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MB"
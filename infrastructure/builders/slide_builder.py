@@ -1,98 +1,398 @@
 """LaTeX slide builder."""
-import subprocess
+import os
+import re
 import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List
+
+from utils.build_cache import CACHE_ROOT, atomic_copy
+from utils.hash_utils import compute_file_hash
+from utils.job_limits import MAX_RSS_MB, JobHistory, crash_signal, exceeded_memory, limited_command
+
+from .deck_deps import DeckState, deck_key, scan_dependencies
+from .latex_format import FORMAT_NAME, FormatCache, format_env, pdflatex_version
+from .latex_log import write_diagnostics
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+DEFAULT_MAX_PASSES = 3
+
+# Where per-compile scratch directories are created (e.g. /dev/shm for
+# tmpfs); None uses the system temp directory
+SCRATCH_ROOT = os.environ.get("COURSE_SCRATCH_DIR") or None
+
+# Auxiliary files whose changes mean references may still be stale
+REFERENCE_FILES = [".aux", ".nav", ".toc", ".snm", ".out"]
+
+# Files carried between a deck's scratch directory and its output directory
+PERSISTED_FILES = REFERENCE_FILES + [".log"]
+
+# Log messages asking for another run (LaTeX kernel, hyperref, rerunfilecheck, ...)
+RERUN_PATTERN = re.compile(r"Rerun to get|Rerun LaTeX|Label\(s\) may have changed", re.IGNORECASE)
 
-def build_slides(manifest: dict, topic: str = None, verbose: bool = False) -> bool:
+
+def build_slides(
+    manifest: dict,
+    topic: str = None,
+    verbose: bool = False,
+    jobs: int = None,
+    max_rss_mb: float = None,
+    max_passes: int = DEFAULT_MAX_PASSES,
+    use_format: bool = True,
+    force: bool = False
+) -> bool:
     """
     Build LaTeX slides.
 
+    Every deck in a topic directory (overview, deepdive, and the
+    accessible, mini, full, top10 ... variants) is compiled. Decks run
+    concurrently, each in its own scratch directory outside the source tree.
+    Decks go through a CompileService: those whose source and included
+    files are unchanged since their last compile (here or during
+    validation) are reported as up to date and skipped.
+
     Args:
         manifest: Course manifest
         topic: Topic ID to build (None for all)
         verbose: Show detailed output
+        jobs: Number of decks compiled concurrently (None for CPU count)
+        max_rss_mb: Memory cap per pdflatex run in MB (None for
+            COURSE_MAX_RSS_MB, off by default; 0 to disable)
+        max_passes: Upper bound on pdflatex passes per deck
+        use_format: Compile against a precompiled preamble format
+            (see latex_format), falling back to a normal compile
+        force: Compile every deck, even those that are up to date
 
     Returns:
         True if all builds succeed
     """
-    all_passed = True
+    jobs = max(1, jobs or os.cpu_count() or 1)
     topics = manifest["topics"]
 
     if topic:
         topics = [t for t in topics if t["id"] == topic]
 
-    for t in topics:
-        topic_id = t["id"]
-        topic_title = t["title"].replace(" ", "_").replace("&", "").replace("/", "_")
-        topic_dir = PROJECT_ROOT / f"slides/{topic_id}_{topic_title}"
-
-        if not topic_dir.exists():
-            print(f"  [SKIP] {topic_id} - directory not found")
-            continue
-
-        # Build overview
-        overview_tex = topic_dir / f"{topic_id}_overview.tex"
-        if overview_tex.exists():
-            passed = _compile_latex(overview_tex, verbose)
-            if not passed:
-                all_passed = False
-        else:
-            print(f"  [SKIP] {topic_id}_overview.tex - not found")
-
-        # Build deepdive
-        deepdive_tex = topic_dir / f"{topic_id}_deepdive.tex"
-        if deepdive_tex.exists():
-            passed = _compile_latex(deepdive_tex, verbose)
-            if not passed:
-                all_passed = False
-        else:
-            print(f"  [SKIP] {topic_id}_deepdive.tex - not found")
+    service = CompileService(verbose, max_rss_mb, max_passes, use_format, force)
 
-    return all_passed
+    results = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # Submit everything up front, then report in topic order
+        futures = []
+        for t in topics:
+            topic_dir = get_topic_dir(t)
+            decks = find_decks(topic_dir) if topic_dir.exists() else None
+            futures.append((t, decks and [
+                pool.submit(service.compile, deck) for deck in decks
+            ], decks))
 
+        for t, deck_futures, decks in futures:
+            if decks is None:
+                print(f"  [SKIP] {t['id']} - directory not found")
+                continue
 
-def _compile_latex(tex_path: Path, verbose: bool) -> bool:
-    """Compile a LaTeX file to PDF."""
-    print(f"  Compiling {tex_path.name}...")
+            print(f"\n  Building slides for {t['id']}...")
+            if not decks:
+                print(f"  [SKIP] {t['id']} - no deck .tex files found")
+                continue
 
-    try:
-        # Run pdflatex twice for references
-        for i in range(2):
+            for future in deck_futures:
+                result = future.result()
+                for line in result["lines"]:
+                    print(line)
+                results.append(result)
+
+    service.save()
+
+    failed = [r for r in results if not r["passed"]]
+    up_to_date = sum(1 for r in results if r.get("up_to_date") and r["passed"])
+    if results:
+        print(f"\n  Decks: {len(results) - len(failed)}/{len(results)} passed ({up_to_date} up to date)")
+        for r in failed:
+            print(f"    - {r['tex'].relative_to(PROJECT_ROOT).as_posix()}")
+
+    return not failed
+
+
+def find_decks(topic_dir: Path) -> List[Path]:
+    """Return the standalone deck .tex files (those with a \\documentclass) in *topic_dir*."""
+    decks = []
+    for tex_path in sorted(topic_dir.glob("*.tex")):
+        with open(tex_path, "r", encoding="utf-8", errors="ignore") as f:
+            head = f.read(4096)
+        if "\\documentclass" in head:
+            decks.append(tex_path)
+    return decks
+
+
+def deck_output_dir(tex_path: Path) -> Path:
+    """Per-deck directory, outside the source tree, for the aux files and log kept between builds."""
+    return CACHE_ROOT / "latex" / tex_path.parent.name / tex_path.stem
+
+
+class CompileService:
+    """Compiles decks for both the slide builder and the LaTeX validator.
+
+    Outcomes are cached by deck build key (see deck_deps), so a deck whose
+    inputs are unchanged since it was last compiled - by ``build slides``
+    or by ``validate latex`` - is not compiled again. A deck that failed
+    on an error in its source (``!`` with an ``l.N`` line) stays failed
+    until an input changes; other failures are retried on the next run.
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        max_rss_mb: float = None,
+        max_passes: int = DEFAULT_MAX_PASSES,
+        use_format: bool = True,
+        force: bool = False
+    ):
+        self.verbose = verbose
+        self.max_rss_mb = MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.max_passes = max_passes
+        self.force = force
+        self.formats = FormatCache() if use_format else None
+        self.history = JobHistory("latex")
+        self.state = DeckState()
+        self.toolchain = pdflatex_version()
+
+    def compile(self, tex_path: Path) -> dict:
+        """Compile a deck unless its inputs are unchanged since the last compile.
+
+        The log of each compile is indexed by latex_log (diagnostics per
+        source line and frame, next to the log).
+
+        Returns:
+            Dict with tex, passed, up_to_date, error (first ``!`` line of
+            the log), error_line (source line of the first error that has
+            one), overfull (box warning count), duration and the buffered
+            output lines
+        """
+        key = deck_key(tex_path, scan_dependencies(tex_path), self.toolchain)
+        cached = None if self.force else self.state.lookup(tex_path, key)
+        if cached:
+            if cached["passed"]:
+                line = f"  [UP-TO-DATE] {tex_path.with_suffix('.pdf').name}"
+            else:
+                line = f"  [FAIL] {tex_path.name} - unchanged since its last failed compile"
+            return {
+                "tex": tex_path,
+                "passed": cached["passed"],
+                "up_to_date": True,
+                "error": cached.get("error"),
+                "overfull": cached.get("overfull", 0),
+                "duration": 0.0,
+                "lines": [line],
+            }
+
+        result = _compile_latex(
+            tex_path, self.verbose, self.history, self.max_rss_mb, self.max_passes, self.formats
+        )
+        # Limits, crashes and a missing pdflatex say nothing about the deck itself
+        if result.get("killed") or result.get("crashed") or result.get("tool_missing"):
+            result.update(error=None, error_line=None, overfull=0)
+            return result
+
+        result.update(_log_summary(tex_path))
+        # Only an error located in the source is sure to happen again
+        if result["passed"] or result["error_line"] is not None:
+            self.state.record(tex_path, key, result["passed"],
+                              {"error": result["error"], "overfull": result["overfull"]})
+        return result
+
+    def save(self) -> None:
+        """Persist compile history and cached outcomes."""
+        self.history.save()
+        self.state.save()
+
+
+def _compile_latex(
+    tex_path: Path,
+    verbose: bool,
+    history: JobHistory = None,
+    max_rss_mb: float = 0,
+    max_passes: int = DEFAULT_MAX_PASSES,
+    formats: FormatCache = None
+) -> dict:
+    """Compile a LaTeX file to PDF.
+
+    With *formats*, the deck is compiled against its precompiled preamble;
+    if that fails the deck is compiled again from scratch, with the aux
+    files written by the failed attempt replaced by the kept ones.
+
+    Another pdflatex pass runs only while the log asks for a rerun or the
+    .aux/.nav/.toc files changed, up to *max_passes*. Aux files are kept
+    between builds, so an edit that leaves references alone needs a single
+    pass.
+
+    Every compile runs in its own scratch directory (under
+    COURSE_SCRATCH_DIR, which may be a tmpfs, or the system temp dir),
+    seeded with the aux files of the deck's last build. The source tree
+    only ever receives the finished PDF, copied next to the .tex
+    atomically; the aux files and log go back to the deck's output
+    directory, so even two compiles of one deck cannot clash. Each pass
+    gets a timeout derived from the
+    deck's compile history and runs under the memory cap; passes stopped
+    by either limit are reported as [KILLED]. Output is buffered so
+    concurrent compiles can be printed in order.
+
+    Returns:
+        Dict with tex, passed, duration and the buffered output lines
+    """
+    lines = [f"  Compiling {tex_path.name}..."]
+    keep_dir = deck_output_dir(tex_path)
+    keep_dir.mkdir(parents=True, exist_ok=True)
+    out_dir = Path(tempfile.mkdtemp(prefix=f"{tex_path.stem}-", dir=SCRATCH_ROOT))
+    _copy_files(keep_dir, out_dir, tex_path.stem, REFERENCE_FILES)
+
+    job = tex_path.relative_to(PROJECT_ROOT).as_posix()
+    timeout = history.timeout_for(job) if history else 120
+    start = time.perf_counter()
+
+    def finish(passed: bool, message: str, **extra) -> dict:
+        lines.append(message)
+        duration = time.perf_counter() - start
+        if passed and history is not None:
+            history.record(job, duration)
+        return {"tex": tex_path, "passed": passed, "duration": duration, "lines": lines, **extra}
+
+    built_pdf = out_dir / f"{tex_path.stem}.pdf"
+
+    def run_passes(command: list, env: dict = None):
+        """Run pdflatex until references settle; returns (result, passes)."""
+        passes = 0
+        while True:
+            before = _reference_state(out_dir, tex_path.stem)
+            passes += 1
             result = subprocess.run(
-                ["pdflatex", "-interaction=nonstopmode", str(tex_path)],
+                limited_command(command, max_rss_mb),
                 cwd=tex_path.parent,
-                capture_output=not verbose,
+                env=env,
+                capture_output=True,
                 text=True,
-                timeout=120
+                errors="replace",
+                timeout=timeout
+            )
+            if verbose:
+                lines.extend(result.stdout.rstrip().splitlines())
+
+            if max_rss_mb and exceeded_memory(result.returncode, result.stderr):
+                return result, passes
+            # A pass that produced no PDF will not be fixed by another one
+            if result.returncode != 0 and not built_pdf.exists():
+                return result, passes
+            if passes >= max_passes or not _needs_rerun(out_dir, tex_path.stem, before):
+                return result, passes
+
+    succeeded = False
+    try:
+        command = ["pdflatex", "-interaction=nonstopmode", f"-output-directory={out_dir}"]
+        prepared = formats.prepare(tex_path, out_dir) if formats is not None else None
+        note = ""
+
+        if prepared:
+            derived, fmt_path = prepared
+            result, passes = run_passes(
+                command + [f"-fmt={FORMAT_NAME}", f"-jobname={tex_path.stem}", derived.as_posix()],
+                format_env(fmt_path)
             )
+            note = ", preamble format"
+            killed = max_rss_mb and exceeded_memory(result.returncode, result.stderr)
+            if result.returncode != 0 and not built_pdf.exists() and not killed:
+                lines.append(f"    [WARN] Compile with preamble format failed, retrying without it")
+                prepared = None
+                # The failed attempt may have left truncated aux files; start from the kept ones
+                for ext in PERSISTED_FILES:
+                    (out_dir / f"{tex_path.stem}{ext}").unlink(missing_ok=True)
+                _copy_files(keep_dir, out_dir, tex_path.stem, REFERENCE_FILES)
+
+        if not prepared:
+            result, passes = run_passes(command + [tex_path.name])
+            note = ""
 
-            if result.returncode != 0 and i == 1:
-                print(f"    [FAIL] Compilation failed")
-                return False
+        if max_rss_mb and exceeded_memory(result.returncode, result.stderr):
+            return finish(False, f"    [KILLED] Exceeded memory limit ({max_rss_mb:.0f} MB)", killed="memory")
 
-        # Move auxiliary files to temp
-        temp_dir = tex_path.parent / "temp"
-        temp_dir.mkdir(exist_ok=True)
+        if crash_signal(result.returncode):
+            return finish(False, f"    [FAIL] pdflatex crashed ({crash_signal(result.returncode)})",
+                          crashed=crash_signal(result.returncode))
 
-        for ext in [".aux", ".log", ".nav", ".out", ".snm", ".toc", ".vrb"]:
-            aux_file = tex_path.with_suffix(ext)
-            if aux_file.exists():
-                shutil.move(str(aux_file), str(temp_dir / aux_file.name))
+        if result.returncode != 0:
+            return finish(False, f"    [FAIL] Compilation failed")
 
         pdf_path = tex_path.with_suffix(".pdf")
-        if pdf_path.exists():
-            print(f"    [PASS] {pdf_path.name}")
-            return True
+        if built_pdf.exists():
+            atomic_copy(built_pdf, pdf_path)
+            succeeded = True
+            return finish(True, f"    [PASS] {pdf_path.name} ({passes} pass{'es' if passes > 1 else ''}{note})")
         else:
-            print(f"    [FAIL] PDF not created")
-            return False
+            return finish(False, f"    [FAIL] PDF not created")
 
     except FileNotFoundError:
-        print(f"    [FAIL] pdflatex not found")
-        return False
+        return finish(False, f"    [FAIL] pdflatex not found", tool_missing=True)
     except subprocess.TimeoutExpired:
-        print(f"    [FAIL] Compilation timed out")
-        return False
+        return finish(False, f"    [KILLED] Exceeded time limit ({timeout:.0f}s)", killed="time")
+    finally:
+        # Aux files of a failed compile could break the next one; keep only its log
+        _copy_files(out_dir, keep_dir, tex_path.stem, PERSISTED_FILES if succeeded else [".log"])
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def _copy_files(src_dir: Path, dest_dir: Path, stem: str, extensions: list) -> None:
+    """Copy ``<stem><ext>`` files that exist from *src_dir* to *dest_dir* atomically."""
+    for ext in extensions:
+        src = src_dir / f"{stem}{ext}"
+        if src.exists():
+            atomic_copy(src, dest_dir / src.name)
+
+
+def _reference_state(out_dir: Path, stem: str) -> dict:
+    """Hashes of the deck's reference files (None where a file is missing)."""
+    state = {}
+    for ext in REFERENCE_FILES:
+        path = out_dir / f"{stem}{ext}"
+        state[ext] = compute_file_hash(path) if path.exists() else None
+    return state
+
+
+def _needs_rerun(out_dir: Path, stem: str, before: dict) -> bool:
+    """Whether the pass just run left references unresolved."""
+    if _reference_state(out_dir, stem) != before:
+        return True
+    log_path = out_dir / f"{stem}.log"
+    if log_path.exists():
+        return bool(RERUN_PATTERN.search(log_path.read_text(encoding="utf-8", errors="ignore")))
+    return False
+
+
+def _log_summary(tex_path: Path) -> dict:
+    """First error, its source line and overfull box count, from the diagnostics index."""
+    log_path = deck_output_dir(tex_path) / f"{tex_path.stem}.log"
+    if not log_path.exists():
+        return {"error": None, "error_line": None, "overfull": 0}
+    index = write_diagnostics(tex_path, log_path)
+    errors = [d for d in index["diagnostics"] if d["type"] == "error"]
+    located = [d["line"] for d in errors if d["line"] is not None]
+    return {
+        "error": f"! {errors[0]['message']}" if errors else None,
+        "error_line": located[0] if located else None,
+        "overfull": index["counts"].get("overfull", 0),
+    }
+
+
+def get_topic_dir(topic: dict) -> Path:
+    """Get topic directory path."""
+    topic_id = topic["id"]
+    topic_title = topic["title"].replace(" ", "_").replace("&", "").replace("/", "_")
+    topic_dir = PROJECT_ROOT / "slides" / f"{topic_id}_{topic_title}"
+    if topic_dir.exists():
+        return topic_dir
+
+    # Folder names are often shortened ("L03_KNN_KMeans"); match on the ID
+    matches = sorted(p for p in (PROJECT_ROOT / "slides").glob(f"{topic_id}_*") if p.is_dir())
+    return matches[0] if matches else topic_dir
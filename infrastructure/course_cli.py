@@ -6,7 +6,7 @@ Usage:
     python course_cli.py <command> [options]
 
 Commands:
-    build       Build course components (slides, charts, notebooks, quizzes)
+    build       Build course components (slides, charts, pdfs, notebooks, quizzes)
     validate    Run validation checks (latex, links, notebooks, charts)
     deploy      Deploy to GitHub/Colab
     status      Show progress dashboard
@@ -16,6 +16,7 @@ Commands:
 """
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -28,11 +29,18 @@ from validators.latex_validator import validate_latex
 from validators.link_validator import validate_links
 from validators.notebook_validator import validate_notebooks
 from validators.chart_validator import validate_charts
-from builders.slide_builder import build_slides
+from validators.chart_regression import DEFAULT_THRESHOLD
+from builders.slide_builder import DEFAULT_MAX_PASSES, build_slides
 from builders.chart_builder import build_charts
 from builders.notebook_builder import build_notebooks
 from builders.quiz_builder import build_quizzes
+from builders.build_graph import CHART, DECK, WEB, build_changed
+from builders.frame_preview import preview_frames
+from builders.pdf_optimizer import publish_pdfs
 from reporters.progress_report import generate_progress_report
+from reporters.build_report import generate_build_report
+from reporters.quality_report import generate_quality_report
+from utils.chart_index import load_chart_index
 
 
 def load_manifest():
@@ -46,12 +54,34 @@ def cmd_build(args):
     """Build course components."""
     manifest = load_manifest()
 
+    if args.component == "slides" and (args.frame or args.frame_title):
+        tex_path = _find_deck(args.deck)
+        if tex_path is None:
+            print("Error: --frame/--frame-title need --deck with a deck name (e.g. L01_overview) or .tex path")
+            sys.exit(1)
+        pdf_path = preview_frames(tex_path, frames=args.frame, title=args.frame_title,
+                                  verbose=args.verbose, use_format=not args.no_fmt,
+                                  max_rss_mb=args.max_rss)
+        sys.exit(0 if pdf_path else 1)
+
+    if (args.changed or args.since) and args.component in GRAPH_KINDS:
+        topic = args.topic if args.topic != "all" else None
+        build_changed(manifest, since=args.since or "HEAD", kinds=GRAPH_KINDS[args.component],
+                      topic=topic, verbose=args.verbose, **_slide_options(args))
+        if args.component == "all":
+            build_notebooks(manifest, verbose=args.verbose)
+            build_quizzes(manifest, verbose=args.verbose)
+        return
+
     if args.component == "slides":
         topic = args.topic if args.topic != "all" else None
-        build_slides(manifest, topic=topic, verbose=args.verbose)
+        build_slides(manifest, topic=topic, verbose=args.verbose, **_slide_options(args))
     elif args.component == "charts":
         topic = args.topic if args.topic != "all" else None
-        build_charts(manifest, topic=topic, verbose=args.verbose)
+        build_charts(manifest, topic=topic, verbose=args.verbose, **_chart_options(args))
+    elif args.component == "pdfs":
+        topic = args.topic if args.topic != "all" else None
+        publish_pdfs(manifest, topic=topic, jobs=args.jobs, force=args.force)
     elif args.component == "notebooks":
         topic = args.topic if args.topic != "all" else None
         build_notebooks(manifest, topic=topic, verbose=args.verbose)
@@ -60,12 +90,53 @@ def cmd_build(args):
         build_quizzes(manifest, quiz_id=quiz_id, verbose=args.verbose)
     elif args.component == "all":
         print("Building all components...")
-        build_charts(manifest, verbose=args.verbose)
-        build_slides(manifest, verbose=args.verbose)
+        build_charts(manifest, verbose=args.verbose, **_chart_options(args))
+        build_slides(manifest, verbose=args.verbose, **_slide_options(args))
         build_notebooks(manifest, verbose=args.verbose)
         build_quizzes(manifest, verbose=args.verbose)
 
 
+def _find_deck(name: str):
+    """Resolve a deck given as a .tex path or a file stem under slides/."""
+    if not name:
+        return None
+    path = Path(name)
+    if path.suffix == ".tex" and path.exists():
+        return path.resolve()
+    matches = sorted((PROJECT_ROOT / "slides").glob(f"*/{path.stem}.tex"))
+    return matches[0] if matches else None
+
+
+# Build graph node kinds rebuilt by --changed / --since for each component
+GRAPH_KINDS = {
+    "charts": (CHART,),
+    "slides": (DECK, WEB),
+    "all": (CHART, DECK, WEB),
+}
+
+
+def _chart_options(args) -> dict:
+    """Chart build options from the build command's flags."""
+    return {
+        "jobs": args.jobs,
+        "force": args.force,
+        "warm": args.warm,
+        "profile": args.profile,
+        "max_rss_mb": args.max_rss,
+    }
+
+
+def _slide_options(args) -> dict:
+    """Slide build options from the build command's flags."""
+    return {
+        "jobs": args.jobs,
+        "max_rss_mb": args.max_rss,
+        "max_passes": args.max_passes,
+        "use_format": not args.no_fmt,
+        "force": args.force,
+    }
+
+
 def cmd_validate(args):
     """Run validation checks."""
     manifest = load_manifest()
@@ -73,7 +144,7 @@ def cmd_validate(args):
 
     if args.check in ["latex", "all"]:
         print("\n=== Validating LaTeX ===")
-        results["latex"] = validate_latex(manifest, strict=args.strict)
+        results["latex"] = validate_latex(manifest, strict=args.strict, jobs=args.jobs)
 
     if args.check in ["links", "all"]:
         print("\n=== Validating Links ===")
@@ -85,7 +156,15 @@ def cmd_validate(args):
 
     if args.check in ["charts", "all"]:
         print("\n=== Validating Charts ===")
-        results["charts"] = validate_charts(manifest, regenerate=args.regenerate)
+        results["charts"] = validate_charts(
+            manifest,
+            regenerate=args.regenerate,
+            warm=args.warm,
+            regression=args.regression,
+            update_baseline=args.update_baseline,
+            threshold=args.threshold,
+            prune_baseline=args.prune_baseline,
+        )
 
     # Summary
     print("\n=== Validation Summary ===")
@@ -111,7 +190,9 @@ def cmd_inventory(args):
     manifest = load_manifest()
 
     if args.action == "list":
-        if args.topic:
+        if args.type == "charts":
+            _list_indexed_charts(manifest, args.topic)
+        elif args.topic:
             # List assets for specific topic
             for topic in manifest["topics"]:
                 if topic["id"] == args.topic:
@@ -137,6 +218,23 @@ def cmd_inventory(args):
         # TODO: Implement add functionality
 
 
+def _list_indexed_charts(manifest: dict, topic: str = None):
+    """List chart scripts from the static chart index with their titles."""
+    in_manifest = {
+        chart.get("file", "")
+        for t in manifest["topics"]
+        for chart in t.get("assets", {}).get("charts", [])
+    }
+    print("\n=== Chart Scripts ===")
+    for rel, entry in load_chart_index().items():
+        chart_dir = Path(rel).parent
+        if topic and not chart_dir.parent.name.startswith(f"{topic}_"):
+            continue
+        title = (entry.get("metadata") or {}).get("title", "(no CHART_METADATA)")
+        flags = "" if rel in in_manifest else " [not in manifest]"
+        print(f"  {chart_dir.parent.name.split('_')[0]}/{chart_dir.name}: {title}{flags}")
+
+
 def cmd_report(args):
     """Generate reports."""
     manifest = load_manifest()
@@ -145,11 +243,13 @@ def cmd_report(args):
         report = generate_progress_report(manifest, detailed=True)
         print(report)
     elif args.type == "build":
-        print("Build report not yet implemented")
+        report = generate_build_report(manifest, sort_by=args.sort, top=args.top)
+        print(report)
     elif args.type == "coverage":
         print("Coverage report not yet implemented")
     elif args.type == "quality":
-        print("Quality report not yet implemented")
+        report = generate_quality_report(manifest, run_checks=args.frames)
+        print(report)
 
 
 def cmd_syllabus(args):
@@ -170,9 +270,30 @@ def main():
 
     # Build command
     build_parser = subparsers.add_parser("build", help="Build course components")
-    build_parser.add_argument("component", choices=["slides", "charts", "notebooks", "quizzes", "all"],
-                              help="Component to build")
+    build_parser.add_argument("component", choices=["slides", "charts", "pdfs", "notebooks", "quizzes", "all"],
+                              help="Component to build ('pdfs' publishes web-optimized deck PDFs to docs/slides/pdf)")
     build_parser.add_argument("--topic", default="all", help="Topic ID (e.g., L01) or 'all'")
+    build_parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                              help="Number of parallel build jobs (default: CPU count)")
+    build_parser.add_argument("--force", action="store_true", help="Rebuild everything, ignoring the build cache")
+    build_parser.add_argument("--warm", action="store_true", help="Run chart scripts in warm worker processes")
+    build_parser.add_argument("--profile", action="store_true",
+                              help="Profile chart scripts (time breakdown and peak memory)")
+    build_parser.add_argument("--max-rss", type=float, default=None, metavar="MB",
+                              help="Address-space cap per chart/LaTeX job in MB (default: $COURSE_MAX_RSS_MB or off; 0 disables)")
+    build_parser.add_argument("--max-passes", type=int, default=DEFAULT_MAX_PASSES,
+                              help="Maximum pdflatex passes per deck; reruns only when references change")
+    build_parser.add_argument("--no-fmt", action="store_true",
+                              help="Compile decks without the precompiled preamble format")
+    build_parser.add_argument("--changed", action="store_true",
+                              help="Rebuild only charts, decks and web slides affected by uncommitted changes")
+    build_parser.add_argument("--since", metavar="REV",
+                              help="Rebuild only what is affected by changes since git revision REV")
+    build_parser.add_argument("--deck", help="Deck for --frame/--frame-title (name like L01_overview or .tex path)")
+    build_parser.add_argument("--frame", metavar="N",
+                              help="Preview only these frames of --deck, e.g. 7 or 3,5-7 (source order)")
+    build_parser.add_argument("--frame-title", metavar="TEXT",
+                              help="Preview the frames of --deck whose title contains TEXT")
     build_parser.set_defaults(func=cmd_build)
 
     # Validate command
@@ -181,9 +302,20 @@ def main():
                                  choices=["latex", "links", "notebooks", "charts", "all"],
                                  help="Validation check to run")
     validate_parser.add_argument("--strict", action="store_true", help="Strict mode (fail on warnings)")
+    validate_parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                                 help="Number of files linted/compiled in parallel (default: CPU count)")
     validate_parser.add_argument("--external", action="store_true", help="Check external links")
     validate_parser.add_argument("--execute", action="store_true", help="Execute notebook cells")
     validate_parser.add_argument("--regenerate", action="store_true", help="Regenerate charts")
+    validate_parser.add_argument("--warm", action="store_true", help="Regenerate charts in warm worker processes")
+    validate_parser.add_argument("--regression", action="store_true",
+                                 help="Flag charts whose output drifted from the baseline")
+    validate_parser.add_argument("--update-baseline", action="store_true",
+                                 help="Store current chart hashes as the regression baseline")
+    validate_parser.add_argument("--prune-baseline", action="store_true",
+                                 help="With --update-baseline, drop baselines of charts that no longer exist")
+    validate_parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                                 help="Bits a chart hash may change before it counts as drifted")
     validate_parser.set_defaults(func=cmd_validate)
 
     # Status command
@@ -196,13 +328,19 @@ def main():
     inventory_parser.add_argument("action", choices=["list", "add", "update", "remove"],
                                   help="Inventory action")
     inventory_parser.add_argument("--topic", help="Topic ID")
-    inventory_parser.add_argument("--type", help="Asset type")
+    inventory_parser.add_argument("--type", help="Asset type ('charts' lists indexed chart scripts)")
     inventory_parser.set_defaults(func=cmd_inventory)
 
     # Report command
     report_parser = subparsers.add_parser("report", help="Generate reports")
     report_parser.add_argument("type", choices=["build", "coverage", "progress", "quality"],
                                help="Report type")
+    report_parser.add_argument("--sort", default="wall",
+                               choices=["wall", "cpu", "import", "compute", "savefig", "rss"],
+                               help="Sort column for the slowest charts table (build report)")
+    report_parser.add_argument("--top", type=int, default=15, help="Rows in the slowest charts table")
+    report_parser.add_argument("--frames", action="store_true",
+                               help="List LaTeX diagnostics per frame (quality report)")
     report_parser.set_defaults(func=cmd_report)
 
     # Syllabus command
@@ -2,40 +2,431 @@
 
 Converts Beamer PDF slides to PNG images and generates Reveal.js HTML slideshow.
 This avoids LaTeX parsing issues - the PDF is already perfectly rendered.
+Each slide also gets WebP (optionally AVIF) copies at several widths, served
+through <picture>/srcset so small screens download small images.
 
 Supports vertical slide navigation when section config files are provided.
 """
 
 from pathlib import Path
-from pdf2image import convert_from_path
+from concurrent.futures import ThreadPoolExecutor
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image
+import hashlib
+import os
+import re
 import shutil
 import json
+import tempfile
 
+from utils.hash_utils import compute_pdf_object_hash, compute_string_hash
 
-def convert_pdf_to_slides(pdf_path: Path, output_dir: Path, dpi: int = 150) -> list:
-    """Convert PDF to PNG images, one per page.
+# Pages rendered by one pdftoppm run; rendering happens chunk by chunk so
+# memory does not grow with the number of pages
+CHUNK_PAGES = 4
+
+# Per-page fingerprints of the PDF the images were rendered from, kept in
+# each deck's image directory
+PAGE_INDEX = "pages.json"
+PAGE_INDEX_VERSION = 3
+
+# Page entries hashed as they are, besides /Resources (see
+# _resources_hash). /Annots is left out: Beamer's navigation links point
+# at other pages and are not drawn.
+PAGE_KEYS = ["/Contents", "/MediaBox", "/CropBox", "/Rotate"]
+
+# Subset tag pdflatex puts in front of embedded font names ("ABCDEF+CMR10")
+FONT_SUBSET_TAG = re.compile(r"^/?[A-Z]{6}\+")
+
+# Compressed copies of each slide PNG, served through <picture>/srcset with
+# the PNG as fallback. Each is written at the full width and at every
+# IMAGE_WIDTHS width below it, as slide_NN-<width>w.<format>.
+IMAGE_FORMATS = ["webp"]
+IMAGE_WIDTHS = [480, 720]
+IMAGE_QUALITY = {"webp": 85, "avif": 60}
+
+# Preferred first in <picture>; browsers take the first source they support
+MODERN_FORMATS = ["avif", "webp"]
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+# Slides ahead of (and behind) the current one whose images are loaded;
+# the rest load on demand, so opening a deck costs the same at any length
+PRELOAD_SLIDES = 2
+
+SLIDE_FILE = re.compile(r"^slide_(\d+)(?:-(\d+)w)?\.(\w+)$")
+
+
+def convert_pdf_to_slides(
+    pdf_path: Path,
+    output_dir: Path,
+    dpi: int = 150,
+    workers: int = None,
+    formats: list = None,
+    lines: list = None
+) -> list:
+    """Convert PDF to PNG images, one per page, with WebP/AVIF copies.
+
+    Only pages whose fingerprint changed since the last conversion are
+    rendered. Images of unchanged pages are kept, and renamed when pages
+    were inserted or deleted before them; images past the last page are
+    removed. Without pikepdf (needed for fingerprints) every page is
+    rendered.
+
+    Pages are rendered straight to disk by pdftoppm in chunks of
+    CHUNK_PAGES, and each page is then re-encoded as an optimized PNG.
+    Chunks run in parallel; at most *workers* pages are held in memory
+    at once, however long the deck is.
 
     Args:
         pdf_path: Path to the PDF file
         output_dir: Directory to save PNG images
         dpi: Resolution (150 is good balance of quality/size)
+        workers: Parallel render/encode jobs (None for CPU count)
+        formats: Compressed formats written next to each PNG ("webp",
+            "avif"; None for IMAGE_FORMATS). Formats Pillow cannot write
+            are skipped.
+        lines: List to append progress lines to instead of printing them
 
     Returns:
         List of paths to generated slide images
     """
     output_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, workers or os.cpu_count() or 1)
+    formats = supported_formats(IMAGE_FORMATS if formats is None else formats)
+    settings = {"dpi": dpi, "formats": formats, "widths": IMAGE_WIDTHS}
+
+    _log(lines, f"  Converting {pdf_path.name} to images...")
+    fingerprints = page_fingerprints(pdf_path, lines)
+    if fingerprints is None:
+        page_count = pdfinfo_from_path(str(pdf_path))["Pages"]
+    else:
+        page_count = len(fingerprints)
+
+    # The old index is dropped first, so an interrupted run re-renders
+    previous = _load_page_index(output_dir, settings)
+    (output_dir / PAGE_INDEX).unlink(missing_ok=True)
+
+    # Rendered pages stay next to the output so the final move is a rename
+    with tempfile.TemporaryDirectory(prefix=".render-", dir=output_dir) as tmp:
+        if fingerprints is None:
+            pending = list(range(1, page_count + 1))
+        else:
+            pending = _reuse_slides(output_dir, Path(tmp), previous, fingerprints)
+        _remove_stale_slides(output_dir, set(range(1, page_count + 1)) - set(pending))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(
+                lambda chunk: _convert_chunk(pdf_path, output_dir, Path(tmp), dpi, formats, *chunk),
+                _chunks(pending)
+            ))
+
+    if fingerprints is not None:
+        _save_page_index(output_dir, fingerprints, settings)
+
+    _log(lines, f"    Created {page_count} slide images for {pdf_path.stem} "
+                f"({len(pending)} rendered, {page_count - len(pending)} unchanged)")
+    return [_slide_path(output_dir, page) for page in range(1, page_count + 1)]
+
+
+def page_fingerprints(pdf_path: Path, lines: list = None) -> list:
+    """Content hash of each page of a PDF.
+
+    A page is hashed by its content stream, its geometry and the XObjects
+    (images, embedded charts) it draws. Fonts count by name only: pdflatex
+    regenerates the shared font subsets on every compile, so hashing their
+    bytes would change every page whenever any frame changed.
+
+    Text drawn on every page still changes every page. With Beamer's
+    ``n/N`` frame counter in the footline, adding or removing a frame
+    changes N and so re-renders the whole deck; editing a frame in place
+    does not.
+
+    A PDF that cannot be read is reported to *lines*, or printed.
+
+    Returns:
+        One hash per page, or None if pikepdf is not installed or the PDF
+        cannot be read
+    """
+    try:
+        import pikepdf
+    except ImportError:
+        return None
+
+    # Shared by all pages, so fonts and charts used on many pages are hashed once
+    memo = {}
+    try:
+        with pikepdf.open(pdf_path) as pdf:
+            return [
+                compute_string_hash("\n".join(
+                    [f"{key} {compute_pdf_object_hash(page.obj[key], memo)}"
+                     for key in PAGE_KEYS if key in page.obj]
+                    + [f"/Resources {_resources_hash(page.obj.get('/Resources'), memo)}"]
+                ))
+                for page in pdf.pages
+            ]
+    except pikepdf.PdfError as e:
+        _log(lines, f"    [WARN] Cannot fingerprint {pdf_path.name} ({e}), rendering every page")
+        return None
+
+
+def _resources_hash(resources, memo: dict) -> str:
+    """Hash of a resource dictionary with fonts reduced to their names.
+
+    Form XObjects are hashed by their content and, recursively, their own
+    resources, so fonts inside embedded charts are treated the same way.
+    """
+    import pikepdf
+
+    if not isinstance(resources, pikepdf.Dictionary):
+        return "none"
+
+    parts = []
+    for category in sorted(resources.keys()):
+        entries = resources[category]
+        if category == "/Font" and isinstance(entries, pikepdf.Dictionary):
+            parts.extend(f"{category}{name} {_font_identity(entries[name], memo)}"
+                         for name in sorted(entries.keys()))
+        elif category == "/XObject" and isinstance(entries, pikepdf.Dictionary):
+            parts.extend(f"{category}{name} {_xobject_hash(entries[name], memo)}"
+                         for name in sorted(entries.keys()))
+        else:
+            parts.append(f"{category} {compute_pdf_object_hash(entries, memo)}")
+    return compute_string_hash("\n".join(parts))
+
+
+def _font_identity(font, memo: dict) -> str:
+    """Font name without its subset tag, plus type and encoding."""
+    base = font.get("/BaseFont")
+    if base is None:
+        # Type 3 fonts have no embedded font program to regenerate
+        return compute_pdf_object_hash(font, memo)
+    encoding = font.get("/Encoding")
+    return " ".join([
+        FONT_SUBSET_TAG.sub("", str(base)),
+        str(font.get("/Subtype")),
+        compute_pdf_object_hash(encoding, memo) if encoding is not None else "-",
+    ])
+
+
+def _xobject_hash(xobject, memo: dict) -> str:
+    """Hash of an image or form XObject, ignoring the fonts' embedded bytes."""
+    if xobject.get("/Subtype") != "/Form":
+        return compute_pdf_object_hash(xobject, memo)
+
+    key = ("form", xobject.objgen) if xobject.is_indirect else None
+    if key in memo:
+        return memo[key]
+    digest = compute_string_hash("\n".join(
+        [hashlib.sha256(xobject.read_bytes()).hexdigest()]
+        + [f"{k} {compute_pdf_object_hash(v, memo)}" for k, v in sorted(xobject.items())
+           if k not in ("/Resources", "/Length", "/Filter", "/DecodeParms")]
+        + [_resources_hash(xobject.get("/Resources"), memo)]
+    ))
+    if key is not None:
+        memo[key] = digest
+    return digest
+
+
+def supported_formats(formats: list) -> list:
+    """The formats of *formats* that Pillow can write here."""
+    if "avif" in formats:
+        try:
+            import pillow_avif  # noqa: F401  (AVIF plugin for Pillow < 11.2)
+        except ImportError:
+            pass
+    Image.init()
+    return [f for f in formats if f.upper() in Image.SAVE]
+
+
+def _reuse_slides(output_dir: Path, tmp_dir: Path, previous: list, fingerprints: list) -> list:
+    """Move the images of unchanged pages to their new page numbers.
+
+    Returns:
+        Page numbers (1-based) that still need rendering
+    """
+    wanted = set(fingerprints)
+    old_pages = {}
+    for page, fingerprint in enumerate(previous, 1):
+        if fingerprint in wanted and fingerprint not in old_pages and _slide_path(output_dir, page).exists():
+            old_pages[fingerprint] = page
+
+    # Kept images are moved aside first, so renames cannot overwrite each other
+    staged = {}
+    for fingerprint, page in old_pages.items():
+        staged[fingerprint] = tmp_dir / f"kept_{len(staged)}"
+        staged[fingerprint].mkdir()
+        for path in _page_files(output_dir, page):
+            os.replace(path, staged[fingerprint] / path.name[len(_slide_path(output_dir, page).stem):])
+
+    pending = []
+    targets = {}
+    for page, fingerprint in enumerate(fingerprints, 1):
+        if fingerprint in staged:
+            targets.setdefault(fingerprint, []).append(page)
+        else:
+            pending.append(page)
+
+    # Identical pages (e.g. repeated section dividers) share one rendered image
+    for fingerprint, pages in targets.items():
+        for staged_file in staged[fingerprint].iterdir():
+            for page in pages[:-1]:
+                shutil.copyfile(staged_file, output_dir / f"{_slide_path(output_dir, page).stem}{staged_file.name}")
+            os.replace(staged_file, output_dir / f"{_slide_path(output_dir, pages[-1]).stem}{staged_file.name}")
+
+    return pending
+
+
+def _remove_stale_slides(output_dir: Path, kept: set) -> None:
+    """Delete slide images (and their compressed copies) of pages not in *kept*."""
+    for path in output_dir.glob("slide_*"):
+        match = SLIDE_FILE.match(path.name)
+        if match and int(match.group(1)) not in kept:
+            path.unlink()
+
+
+def _page_files(output_dir: Path, page: int) -> list:
+    """The slide PNG of *page* and its compressed copies."""
+    stem = _slide_path(output_dir, page).stem
+    return [path for path in output_dir.glob(f"{stem}*")
+            if SLIDE_FILE.match(path.name) and int(SLIDE_FILE.match(path.name).group(1)) == page]
+
+
+def _chunks(pages: list) -> list:
+    """Split sorted page numbers into runs of consecutive pages, at most CHUNK_PAGES long."""
+    chunks = []
+    for page in pages:
+        if chunks and page == chunks[-1][1] + 1 and page - chunks[-1][0] < CHUNK_PAGES:
+            chunks[-1] = (chunks[-1][0], page)
+        else:
+            chunks.append((page, page))
+    return chunks
+
+
+def _load_page_index(output_dir: Path, settings: dict) -> list:
+    """Page fingerprints the images in *output_dir* were rendered from with *settings* ([] if unknown)."""
+    index_path = output_dir / PAGE_INDEX
+    if not index_path.exists():
+        return []
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return []
+    if index.get("version") != PAGE_INDEX_VERSION or index.get("settings") != settings:
+        return []
+    return index.get("pages", [])
+
+
+def _save_page_index(output_dir: Path, fingerprints: list, settings: dict) -> None:
+    index_path = output_dir / PAGE_INDEX
+    tmp_path = index_path.with_name(f".{PAGE_INDEX}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": PAGE_INDEX_VERSION, "settings": settings, "pages": fingerprints}, f, indent=2)
+    os.replace(tmp_path, index_path)
+
+
+def _slide_path(output_dir: Path, page: int) -> Path:
+    return output_dir / f"slide_{page:02d}.png"
+
+
+def _convert_chunk(
+    pdf_path: Path,
+    output_dir: Path,
+    tmp_dir: Path,
+    dpi: int,
+    formats: list,
+    first: int,
+    last: int
+) -> list:
+    """Render pages *first*..*last* with pdftoppm and encode them as slide images.
+
+    Returns:
+        Slide image paths in page order
+    """
+    rendered = convert_from_path(
+        str(pdf_path),
+        dpi=dpi,
+        first_page=first,
+        last_page=last,
+        output_folder=str(tmp_dir),
+        output_file=f"chunk{first:04d}",
+        fmt="png",
+        paths_only=True
+    )
+    return [
+        _encode_slide(page_file, _slide_path(output_dir, page), formats)
+        for page, page_file in enumerate(sorted(rendered), first)
+    ]
+
+
+def _encode_slide(rendered: str, slide_path: Path, formats: list) -> Path:
+    """Re-encode one rendered page as an optimized PNG at *slide_path*, plus its compressed copies."""
+    with Image.open(rendered) as image:
+        _save_image(image, slide_path, "PNG", optimize=True)
+        widths = [w for w in IMAGE_WIDTHS if w < image.width] + [image.width]
+        for width in widths:
+            scaled = image
+            if width != image.width:
+                scaled = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            for fmt in formats:
+                _save_image(scaled, slide_path.with_name(f"{slide_path.stem}-{width}w.{fmt}"),
+                            fmt.upper(), quality=IMAGE_QUALITY.get(fmt, 80))
+    os.remove(rendered)
+    return slide_path
+
+
+def _save_image(image: Image.Image, path: Path, fmt: str, **params) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    image.save(tmp_path, fmt, **params)
+    os.replace(tmp_path, path)
+
+
+def slide_sources(slide_path: Path) -> dict:
+    """Compressed copies of a slide image on disk.
+
+    Returns:
+        Format -> [(width, path)] sorted by width, for formats that have copies
+    """
+    sources = {}
+    for path in slide_path.parent.glob(f"{slide_path.stem}-*w.*"):
+        match = SLIDE_FILE.match(path.name)
+        if match and match.group(2) and path.name.startswith(f"{slide_path.stem}-"):
+            sources.setdefault(match.group(3), []).append((int(match.group(2)), path))
+    return {fmt: sorted(paths) for fmt, paths in sources.items()}
+
+
+def image_sizes(slide_paths: list) -> dict:
+    """Bytes a deck's slide images take, for the summary.
+
+    Returns:
+        Dict with "png" (all slide PNGs) and, per compressed format,
+        (full-width bytes, smallest-width bytes, smallest width)
+    """
+    sizes = {"png": sum(p.stat().st_size for p in slide_paths if p.exists())}
+    totals = {}
+    for slide in slide_paths:
+        for fmt, paths in slide_sources(slide).items():
+            full, smallest, width = totals.get(fmt, (0, 0, None))
+            totals[fmt] = (full + paths[-1][1].stat().st_size,
+                           smallest + paths[0][1].stat().st_size,
+                           paths[0][0] if width is None else min(width, paths[0][0]))
+    sizes.update(totals)
+    return sizes
+
 
-    print(f"  Converting {pdf_path.name} to images...")
-    images = convert_from_path(str(pdf_path), dpi=dpi)
+def format_sizes(sizes: dict) -> str:
+    """One-line before/after summary of image_sizes()."""
+    parts = []
+    for fmt in MODERN_FORMATS:
+        if fmt in sizes:
+            full, smallest, width = sizes[fmt]
+            saved = 100 * (sizes["png"] - full) / sizes["png"] if sizes["png"] else 0
+            parts.append(f"{fmt} {_mb(full)} ({saved:.0f}% smaller, {_mb(smallest)} at {width}w)")
+    return f"PNG {_mb(sizes['png'])}" + (f" -> {', '.join(parts)}" if parts else "")
 
-    slide_paths = []
-    for i, image in enumerate(images, 1):
-        slide_path = output_dir / f"slide_{i:02d}.png"
-        image.save(slide_path, "PNG", optimize=True)
-        slide_paths.append(slide_path)
 
-    print(f"    Created {len(slide_paths)} slide images")
-    return slide_paths
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MB"
 
 
 def load_section_config(sections_dir: Path, slide_name: str) -> dict:
@@ -55,16 +446,48 @@ def load_section_config(sections_dir: Path, slide_name: str) -> dict:
     return None
 
 
+def _slide_image_html(slide: Path, images_subdir: str, number: int, indent: str) -> str:
+    """Markup for one slide image: a <picture> with the compressed copies
+    by width when there are any, with the PNG <img> as fallback.
+
+    Image URLs are left in data- attributes and filled in when the slide
+    comes within Reveal's viewDistance: a plain <img data-src> by Reveal
+    itself, a <picture> by loadPictures() in the page script (Reveal does
+    not handle srcset, and must not load the fallback PNG first).
+    """
+    sources = slide_sources(slide)
+    formats = [fmt for fmt in MODERN_FORMATS if fmt in sources]
+    pad = indent + "    " if formats else indent
+
+    lines = [f"{indent}<picture>"] if formats else []
+    for fmt in formats:
+        srcset = ", ".join(f"{images_subdir}/{path.name} {width}w" for width, path in sources[fmt])
+        lines.append(f'{pad}<source type="{MIME_TYPES[fmt]}" sizes="100vw" data-srcset="{srcset}">')
+    lines.extend([
+        f'{pad}<img {"data-lazy-src" if formats else "data-src"}="{images_subdir}/{slide.name}"',
+        f'{pad}     style="max-width:100%; max-height:95vh; object-fit:contain;"',
+        f'{pad}     alt="Slide {number}">',
+    ])
+    if formats:
+        lines.append(f"{indent}</picture>")
+    return "\n".join(lines)
+
+
 def generate_revealjs_html(
     slide_paths: list,
     slide_name: str,
     title: str,
     output_path: Path,
     images_subdir: str,
-    section_config: dict = None
+    section_config: dict = None,
+    preload_slides: int = PRELOAD_SLIDES,
+    lines: list = None
 ) -> None:
     """Generate Reveal.js HTML with image slides.
 
+    Slide images are lazy-loaded: only slides within *preload_slides* of
+    the current one are fetched.
+
     Args:
         slide_paths: List of paths to slide images
         slide_name: Name for the slide deck (e.g., L01_overview)
@@ -72,6 +495,8 @@ def generate_revealjs_html(
         output_path: Path to save the HTML file
         images_subdir: Subdirectory name for images (relative to HTML)
         section_config: Optional section grouping config for vertical slides
+        preload_slides: Slides ahead/behind the current one to preload
+        lines: List to append progress lines to instead of printing them
     """
     # Generate slide sections (nested if config provided)
     if section_config and 'sections' in section_config:
@@ -87,9 +512,7 @@ def generate_revealjs_html(
                 if 1 <= slide_num <= len(slide_paths):
                     slide = slide_paths[slide_num - 1]
                     inner_slides.append(f'''    <section data-slide="{slide_num}">
-        <img src="{images_subdir}/{slide.name}"
-             style="max-width:100%; max-height:95vh; object-fit:contain;"
-             alt="Slide {slide_num}">
+{_slide_image_html(slide, images_subdir, slide_num, "        ")}
     </section>''')
 
             if inner_slides:
@@ -102,9 +525,7 @@ def generate_revealjs_html(
         sections = []
         for i, slide in enumerate(slide_paths, 1):
             sections.append(f'''<section data-slide="{i}">
-    <img src="{images_subdir}/{slide.name}"
-         style="max-width:100%; max-height:95vh; object-fit:contain;"
-         alt="Slide {i}">
+{_slide_image_html(slide, images_subdir, i, "    ")}
 </section>''')
 
     slides_content = '\n\n'.join(sections)
@@ -291,6 +712,10 @@ def generate_revealjs_html(
             // Auto-slide (disabled)
             autoSlide: 0,
 
+            // Lazy loading: images of slides closer than viewDistance load
+            viewDistance: {preload_slides + 1},
+            mobileViewDistance: {preload_slides + 1},
+
             // Menu plugin configuration
             menu: {{
                 side: 'left',
@@ -356,6 +781,28 @@ def generate_revealjs_html(
             ]
         }});
 
+        // Fill in <picture> sources and images of slides Reveal has made
+        // visible (those within viewDistance), or of every slide when printing
+        function loadPictures(all) {{
+            document.querySelectorAll('.reveal .slides section[data-slide]').forEach(slide => {{
+                if (!all && (slide.style.display === '' || slide.style.display === 'none')) return;
+                slide.querySelectorAll('source[data-srcset]').forEach(source => {{
+                    source.srcset = source.dataset.srcset;
+                    source.removeAttribute('data-srcset');
+                }});
+                slide.querySelectorAll('img[data-lazy-src], img[data-src]').forEach(img => {{
+                    img.src = img.dataset.lazySrc || img.dataset.src;
+                    img.removeAttribute('data-lazy-src');
+                    img.removeAttribute('data-src');
+                }});
+            }});
+        }}
+
+        Reveal.on('ready', () => loadPictures(false));
+        Reveal.on('slidechanged', () => loadPictures(false));
+        Reveal.on('overviewshown', () => loadPictures(false));
+        Reveal.on('pdf-ready', () => loadPictures(true));
+
         // Custom keyboard shortcuts
         Reveal.addKeyBinding({{ keyCode: 76, key: 'L' }}, toggleSpotlight);  // L for spotlight
 
@@ -393,22 +840,99 @@ def generate_revealjs_html(
 '''
 
     output_path.write_text(html, encoding='utf-8')
-    print(f"    Generated {output_path.name}")
+    _log(lines, f"    Generated {output_path.name}")
+
+
+def convert_pdf(
+    pdf_path: Path,
+    output_dir: Path,
+    dpi: int = 150,
+    sections_dir: Path = None,
+    workers: int = None,
+    formats: list = None,
+    preload_slides: int = PRELOAD_SLIDES,
+    lines: list = None
+) -> Path:
+    """Convert one PDF deck to slide images and a Reveal.js page.
+
+    Args:
+        pdf_path: Path to the PDF file
+        output_dir: Directory for output (HTML and images)
+        dpi: Image resolution
+        sections_dir: Directory containing section JSON configs (optional)
+        workers: Parallel page render/encode jobs (None for CPU count)
+        formats: Compressed image formats besides PNG (None for IMAGE_FORMATS)
+        preload_slides: Slides ahead/behind the current one the page preloads
+        lines: List to append progress lines to instead of printing them,
+            for callers that run conversions concurrently
+
+    Returns:
+        Path of the generated HTML file
+    """
+    slide_name = pdf_path.stem  # e.g., L01_overview
+
+    # Convert PDF to images
+    images_dir = output_dir / "images" / slide_name
+    slide_paths = convert_pdf_to_slides(pdf_path, images_dir, dpi, workers, formats, lines)
+
+    # Load section config if available
+    section_config = None
+    if sections_dir:
+        section_config = load_section_config(sections_dir, slide_name)
+        if section_config:
+            _log(lines, f"    Using section config: {len(section_config.get('sections', []))} sections")
+
+    # Generate HTML
+    title = slide_name.replace("_", ": ").replace("L0", "L")
+    html_path = output_dir / f"{slide_name}.html"
+
+    generate_revealjs_html(
+        slide_paths=slide_paths,
+        slide_name=slide_name,
+        title=title,
+        output_path=html_path,
+        images_subdir=f"images/{slide_name}",
+        section_config=section_config,
+        preload_slides=preload_slides,
+        lines=lines
+    )
+
+    nav_type = "vertical" if section_config else "flat"
+    _log(lines, f"  OK: {pdf_path.name} -> {html_path.name} ({len(slide_paths)} slides, {nav_type})")
+    _log(lines, f"    Images: {format_sizes(image_sizes(slide_paths))}")
+    return html_path
+
+
+def _log(lines: list, message: str) -> None:
+    """Append *message* to *lines*, or print it when there is no list."""
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
 
 
 def convert_all_pdfs(
     pdf_dir: Path,
     output_dir: Path,
     dpi: int = 150,
-    sections_dir: Path = None
+    sections_dir: Path = None,
+    jobs: int = None,
+    formats: list = None,
+    preload_slides: int = PRELOAD_SLIDES
 ) -> dict:
     """Convert all PDFs in a directory to Reveal.js slideshows.
 
+    Decks are converted concurrently; the CPUs are split between the
+    decks in flight, so pages of one deck still render in parallel.
+
     Args:
         pdf_dir: Directory containing PDF files
         output_dir: Directory for output (HTML and images)
         dpi: Image resolution
         sections_dir: Directory containing section JSON configs (optional)
+        jobs: Number of decks converted concurrently (None for CPU count)
+        formats: Compressed image formats besides PNG (None for IMAGE_FORMATS)
+        preload_slides: Slides ahead/behind the current one each page preloads
 
     Returns:
         Dictionary with conversion results
@@ -425,51 +949,36 @@ def convert_all_pdfs(
         print(f"Sections: {sections_dir}")
     print()
 
-    converted = 0
-    failed = 0
-
-    for pdf_path in pdf_files:
-        slide_name = pdf_path.stem  # e.g., L01_overview
-
-        # Create images directory
-        images_dir = output_dir / "images" / slide_name
+    cpus = os.cpu_count() or 1
+    jobs = max(1, min(jobs or cpus, len(pdf_files)))
+    workers = max(1, cpus // jobs)
 
+    def convert(pdf_path: Path) -> tuple:
+        """Output lines and slide images of the converted deck (None if it failed)."""
+        lines = []
         try:
-            # Convert PDF to images
-            slide_paths = convert_pdf_to_slides(pdf_path, images_dir, dpi)
-
-            # Load section config if available
-            section_config = None
-            if sections_dir:
-                section_config = load_section_config(sections_dir, slide_name)
-                if section_config:
-                    print(f"    Using section config: {len(section_config.get('sections', []))} sections")
-
-            # Generate HTML
-            title = slide_name.replace("_", ": ").replace("L0", "L")
-            html_path = output_dir / f"{slide_name}.html"
-
-            generate_revealjs_html(
-                slide_paths=slide_paths,
-                slide_name=slide_name,
-                title=title,
-                output_path=html_path,
-                images_subdir=f"images/{slide_name}",
-                section_config=section_config
-            )
-
-            nav_type = "vertical" if section_config else "flat"
-            print(f"  OK: {pdf_path.name} -> {html_path.name} ({len(slide_paths)} slides, {nav_type})")
-            converted += 1
-
+            convert_pdf(pdf_path, output_dir, dpi, sections_dir, workers, formats, preload_slides, lines)
+            return lines, sorted((output_dir / "images" / pdf_path.stem).glob("slide_*.png"))
         except Exception as e:
-            print(f"  FAILED: {pdf_path.name}: {e}")
-            failed += 1
+            lines.append(f"  FAILED: {pdf_path.name}: {e}")
+            return lines, None
+
+    # Output is buffered per deck and printed in order
+    outcomes = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for lines, slides in pool.map(convert, pdf_files):
+            for line in lines:
+                print(line)
+            outcomes.append(slides)
+
+    converted = len([o for o in outcomes if o is not None])
+    failed = len(outcomes) - converted
 
     print()
     print("=" * 50)
     print(f"Converted: {converted}")
     print(f"Failed: {failed}")
+    print(f"Images: {format_sizes(image_sizes([p for o in outcomes if o for p in o]))}")
 
     return {"converted": converted, "failed": failed}
 
@@ -487,13 +996,23 @@ if __name__ == "__main__":
     output_dir = Path("docs/slides")
     sections_dir = Path("docs/slides/sections")
 
-    # Parse command line args
+    # Parse command line args: [dpi] [jobs] [--avif] [--preload=N]
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
     dpi = 150
-    if len(sys.argv) > 1:
-        dpi = int(sys.argv[1])
+    if len(args) > 0:
+        dpi = int(args[0])
+    jobs = None
+    if len(args) > 1:
+        jobs = int(args[1])
+    formats = IMAGE_FORMATS + (["avif"] if "--avif" in sys.argv else [])
+    preload_slides = PRELOAD_SLIDES
+    for arg in sys.argv[1:]:
+        if arg.startswith("--preload="):
+            preload_slides = int(arg.split("=", 1)[1])
 
     print(f"PDF to Reveal.js Converter")
     print(f"DPI: {dpi}")
+    print(f"Formats: png, {', '.join(supported_formats(formats)) or 'no compressed copies'}")
     print()
 
-    results = convert_all_pdfs(pdf_dir, output_dir, dpi, sections_dir)
+    results = convert_all_pdfs(pdf_dir, output_dir, dpi, sections_dir, jobs, formats, preload_slides)
@@ -3,12 +3,28 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from builders.chart_profiler import load_profile_runs
+from utils.build_cache import CACHE_ROOT
+from utils.chart_index import load_chart_index
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+# Sort keys accepted for the slowest charts table
+PROFILE_SORT_KEYS = {
+    "wall": "wall_s",
+    "cpu": "cpu_s",
+    "import": "import_s",
+    "compute": "compute_s",
+    "savefig": "savefig_s",
+    "rss": "peak_rss_mb",
+}
+
 
 def generate_build_report(
     manifest: dict,
-    include_timestamps: bool = True
+    include_timestamps: bool = True,
+    sort_by: str = "wall",
+    top: int = 15
 ) -> str:
     """
     Generate a build status report.
@@ -16,6 +32,8 @@ def generate_build_report(
     Args:
         manifest: Course manifest
         include_timestamps: Include file modification times
+        sort_by: Column for the slowest charts table (see PROFILE_SORT_KEYS)
+        top: Number of charts listed in the slowest charts table
 
     Returns:
         Formatted build report string
@@ -80,6 +98,18 @@ def generate_build_report(
             status = "[X]" if nb_path.exists() else "[ ]"
             lines.append(f"    {status} Notebook")
 
+    # Chart scripts vs. manifest (static index, no scripts are run)
+    index_lines = _format_chart_index(manifest)
+    if index_lines:
+        lines.append("")
+        lines.extend(index_lines)
+
+    # Chart profile (from `build charts --profile`)
+    profile_lines = _format_slowest_charts(sort_by, top)
+    if profile_lines:
+        lines.append("")
+        lines.extend(profile_lines)
+
     # Recent builds
     if include_timestamps:
         lines.append("")
@@ -94,6 +124,78 @@ def generate_build_report(
     return "\n".join(lines)
 
 
+def _format_slowest_charts(sort_by: str, top: int) -> List[str]:
+    """Format the latest chart profile as a table with deltas to the previous run."""
+    runs = load_profile_runs()
+    if not runs:
+        return []
+
+    key = PROFILE_SORT_KEYS.get(sort_by, "wall_s")
+    latest = runs[-1]
+    charts = latest.get("charts", {})
+
+    # Most recent earlier measurement of each chart
+    previous = {}
+    for run in runs[:-1]:
+        previous.update(run.get("charts", {}))
+
+    ranked = sorted(charts.items(), key=lambda item: item[1].get(key, 0), reverse=True)
+
+    timestamp = latest.get("timestamp", "")[:16].replace("T", " ")
+    lines = [
+        f"SLOWEST CHARTS (profiled {timestamp}, sorted by {sort_by})",
+        "-" * 40,
+        f"  {'Chart':<36} {'Wall':>7} {'Delta':>7} {'CPU':>7} {'Import':>7} "
+        f"{'Compute':>8} {'Savefig':>8} {'RSS MB':>7}",
+    ]
+    for script, p in ranked[:top]:
+        name = Path(script).parent.name
+        before = previous.get(script, {}).get(key)
+        if before is None:
+            delta = "new"
+        elif key == "peak_rss_mb":
+            delta = f"{p.get(key, 0) - before:+.0f}"
+        else:
+            delta = f"{p.get(key, 0) - before:+.1f}s"
+        status = "" if p.get("passed", True) else "  [FAIL]"
+        lines.append(
+            f"  {name[:36]:<36} {p.get('wall_s', 0):>6.1f}s {delta:>7} {p.get('cpu_s', 0):>6.1f}s "
+            f"{p.get('import_s', 0):>6.1f}s {p.get('compute_s', 0):>7.1f}s "
+            f"{p.get('savefig_s', 0):>7.1f}s {p.get('peak_rss_mb', 0):>7.0f}{status}"
+        )
+
+    total = sum(p.get("wall_s", 0) for p in charts.values())
+    lines.append(f"  {len(charts)} charts, {total:.1f}s total wall time")
+    return lines
+
+
+def _format_chart_index(manifest: dict) -> List[str]:
+    """List chart scripts missing metadata, failing to parse or absent from the manifest."""
+    chart_index = load_chart_index()
+    if not chart_index:
+        return []
+
+    in_manifest = {
+        chart.get("file", "")
+        for topic in manifest.get("topics", [])
+        for chart in topic.get("assets", {}).get("charts", [])
+    }
+    unlisted = [rel for rel in chart_index if rel not in in_manifest]
+    broken = [rel for rel, entry in chart_index.items() if entry.get("error")]
+    no_metadata = [rel for rel, entry in chart_index.items()
+                   if not entry.get("error") and not entry.get("metadata")]
+
+    lines = ["CHART INDEX", "-" * 40]
+    lines.append(f"  {len(chart_index)} chart scripts, {len(chart_index) - len(unlisted)} in manifest")
+    for label, paths in [("Not in manifest", unlisted),
+                         ("Without CHART_METADATA", no_metadata),
+                         ("Parse errors", broken)]:
+        if paths:
+            lines.append(f"  {label} ({len(paths)}):")
+            lines.extend(f"    - {Path(rel).parent.as_posix()}" for rel in paths)
+    return lines
+
+
 def _collect_build_stats(manifest: dict) -> Dict:
     """Collect build statistics from manifest."""
     stats = {
@@ -163,9 +265,12 @@ def _chart_exists(chart: dict) -> bool:
 
 
 def _get_recent_builds() -> List[Dict]:
-    """Get recently modified PDFs."""
+    """Get recently modified PDFs (cached build outputs are not listed)."""
+    cache_root = CACHE_ROOT.resolve()
     pdfs = []
     for pdf in PROJECT_ROOT.rglob("*.pdf"):
+        if cache_root in pdf.resolve().parents:
+            continue
         if "temp" not in str(pdf) and ".git" not in str(pdf):
             pdfs.append({
                 "file": str(pdf.relative_to(PROJECT_ROOT)),
@@ -4,6 +4,8 @@ from datetime import datetime
 from typing import Dict, List
 import json
 
+from utils.chart_index import load_chart_index
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
 
@@ -149,7 +151,7 @@ def generate_html_dashboard(manifest: dict, output_path: Path = None) -> str:
             <div class="stat-card">
                 <h3>Charts</h3>
                 <div class="value">{stats['charts_built']}/{stats['charts_total']}</div>
-                <div class="sub">Generated</div>
+                <div class="sub">Generated | {stats['charts_with_metadata']} with metadata</div>
                 <div class="progress-bar">
                     <div class="fill {_get_progress_class(stats['charts_built'], stats['charts_total'])}"
                          style="width: {_calc_percent(stats['charts_built'], stats['charts_total'])}%"></div>
@@ -225,10 +227,13 @@ def _collect_all_stats(manifest: dict) -> Dict:
         "modules_exist": 0,
         "charts_total": 0,
         "charts_built": 0,
+        "charts_with_metadata": 0,
         "tests_total": 6,
         "tests_pass": 0
     }
 
+    chart_index = load_chart_index()
+
     # Count complete topics
     for topic in manifest.get("topics", []):
         if topic.get("status") == "complete":
@@ -243,6 +248,8 @@ def _collect_all_stats(manifest: dict) -> Dict:
                 pdf_path = PROJECT_ROOT / Path(chart_file).parent / "chart.pdf"
                 if pdf_path.exists():
                     stats["charts_built"] += 1
+                if (chart_index.get(chart_file) or {}).get("metadata"):
+                    stats["charts_with_metadata"] += 1
 
     # Count modules
     infra_dir = PROJECT_ROOT / "infrastructure"
@@ -5,6 +5,10 @@ from typing import Dict, List, Optional
 import subprocess
 import re
 
+from builders.latex_log import load_diagnostics
+from builders.slide_builder import deck_output_dir, get_topic_dir
+from utils.chart_index import load_chart_index
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
 
@@ -14,7 +18,7 @@ def generate_quality_report(manifest: dict, run_checks: bool = False) -> str:
 
     Args:
         manifest: Course manifest
-        run_checks: Actually run validation checks (slower)
+        run_checks: Also list LaTeX diagnostics per frame
 
     Returns:
         Formatted quality report string
@@ -37,6 +41,8 @@ def generate_quality_report(manifest: dict, run_checks: bool = False) -> str:
     lines.append(f"  Overflow warnings: {latex_stats['overflow_warnings']}")
     lines.append(f"  Compilation errors: {latex_stats['compilation_errors']}")
     lines.append(f"  Missing figures:   {latex_stats['missing_figures']}")
+    for frame in latex_stats["frames"]:
+        lines.append(f"    - {frame}")
     lines.append("")
 
     # Chart quality
@@ -101,16 +107,22 @@ def generate_quality_report(manifest: dict, run_checks: bool = False) -> str:
 
 
 def _check_latex_quality(manifest: dict, run_checks: bool) -> Dict:
-    """Check LaTeX quality metrics."""
+    """Check LaTeX quality metrics.
+
+    Compile results come from the diagnostics index the slide builder
+    writes next to each deck's log, so nothing is compiled here. Decks
+    without a log are checked for missing figures in the source.
+    """
     stats = {
         "files_checked": 0,
         "overflow_warnings": 0,
         "compilation_errors": 0,
-        "missing_figures": 0
+        "missing_figures": 0,
+        "frames": []
     }
 
     for topic in manifest.get("topics", []):
-        topic_dir = _get_topic_dir(topic)
+        topic_dir = get_topic_dir(topic)
         topic_id = topic["id"]
 
         for suffix in ["overview", "deepdive"]:
@@ -118,12 +130,20 @@ def _check_latex_quality(manifest: dict, run_checks: bool) -> Dict:
             if tex_file.exists():
                 stats["files_checked"] += 1
 
-                if run_checks:
-                    # Check for overflow in log
-                    log_file = topic_dir / "temp" / f"{topic_id}_{suffix}.log"
-                    if log_file.exists():
-                        content = log_file.read_text(errors='ignore')
-                        stats["overflow_warnings"] += content.count("Overfull")
+                # Deck output directory, or the temp/ layouts of older builds
+                log_file = deck_output_dir(tex_file) / f"{tex_file.stem}.log"
+                for old_log in [topic_dir / "temp" / tex_file.stem / log_file.name, topic_dir / "temp" / log_file.name]:
+                    if not log_file.exists():
+                        log_file = old_log
+                index = load_diagnostics(tex_file, log_file)
+                if index is not None:
+                    counts = index["counts"]
+                    stats["overflow_warnings"] += counts.get("overfull", 0)
+                    stats["compilation_errors"] += counts.get("error", 0)
+                    stats["missing_figures"] += counts.get("missing_file", 0)
+                    if run_checks:
+                        stats["frames"].extend(_frame_issues(tex_file, index))
+                    continue
 
                 # Check for missing figures in tex
                 content = tex_file.read_text(errors='ignore')
@@ -136,6 +156,23 @@ def _check_latex_quality(manifest: dict, run_checks: bool) -> Dict:
     return stats
 
 
+def _frame_issues(tex_file: Path, index: Dict) -> List[str]:
+    """One line per frame with diagnostics, e.g. 'L01_overview frame 7 (Title): 2 overfull'."""
+    by_frame = {}
+    for item in index["diagnostics"]:
+        if item["frame"] is None or item["type"] == "underfull":
+            continue
+        entry = by_frame.setdefault(item["frame"], {"title": item["frame_title"], "types": {}})
+        entry["types"][item["type"]] = entry["types"].get(item["type"], 0) + 1
+
+    lines = []
+    for number, entry in sorted(by_frame.items()):
+        found = ", ".join(f"{n} {kind.replace('_', ' ')}" for kind, n in sorted(entry["types"].items()))
+        title = f" ({entry['title']})" if entry["title"] else ""
+        lines.append(f"{tex_file.stem} frame {number}{title}: {found}")
+    return lines
+
+
 def _check_chart_quality(manifest: dict) -> Dict:
     """Check chart quality metrics."""
     stats = {
@@ -146,6 +183,7 @@ def _check_chart_quality(manifest: dict) -> Dict:
     }
 
     total_size = 0
+    chart_index = load_chart_index()
 
     for topic in manifest.get("topics", []):
         charts = topic.get("assets", {}).get("charts", [])
@@ -162,10 +200,8 @@ def _check_chart_quality(manifest: dict) -> Dict:
                     stats["pdfs_exist"] += 1
                     total_size += pdf_path.stat().st_size
 
-                if py_path.exists():
-                    content = py_path.read_text(errors='ignore')
-                    if "CHART_METADATA" in content:
-                        stats["with_metadata"] += 1
+                if py_path.exists() and (chart_index.get(chart_file) or {}).get("metadata"):
+                    stats["with_metadata"] += 1
 
     if stats["pdfs_exist"] > 0:
         stats["avg_size_kb"] = (total_size / stats["pdfs_exist"]) / 1024
@@ -281,6 +317,8 @@ def _collect_issues(latex: Dict, chart: Dict, nb: Dict, content: Dict) -> List[s
         issues.append(f"LaTeX: {latex['overflow_warnings']} overflow warnings")
     if latex["missing_figures"] > 0:
         issues.append(f"LaTeX: {latex['missing_figures']} missing figures")
+    if latex["compilation_errors"] > 0:
+        issues.append(f"LaTeX: {latex['compilation_errors']} compilation errors")
     if chart["total"] > chart["pdfs_exist"]:
         issues.append(f"Charts: {chart['total'] - chart['pdfs_exist']} PDFs not generated")
     if content["with_objectives"] < content["total_topics"]:
@@ -289,10 +327,3 @@ def _collect_issues(latex: Dict, chart: Dict, nb: Dict, content: Dict) -> List[s
         issues.append(f"Content: {content['total_topics'] - content['with_decision']} topics missing decision framework")
 
     return issues
-
-
-def _get_topic_dir(topic: dict) -> Path:
-    """Get topic directory path."""
-    topic_id = topic["id"]
-    topic_title = topic["title"].replace(" ", "_").replace("&", "").replace("/", "_")
-    return PROJECT_ROOT / "slides" / f"{topic_id}_{topic_title}"
@@ -40,10 +40,20 @@ WIKI_URL = "https://digital-ai-finance.github.io/methods-algorithms/"
 
 
 def convert_pdf_to_png(pdf_path: Path, output_dir: Path) -> Path:
-    """Convert a PDF chart to PNG using pdf2image or ImageMagick."""
+    """Convert a PDF chart to PNG using pdf2image or ImageMagick.
+
+    The untracked chart.png that chart builds export next to the PDF is
+    used directly when it is at least as new as the PDF.
+    """
     png_name = f"{pdf_path.parent.name}.png"
     png_path = output_dir / png_name
 
+    web_png = pdf_path.with_suffix('.png')
+    if web_png.exists() and web_png.stat().st_mtime >= pdf_path.stat().st_mtime:
+        if not png_path.exists() or png_path.stat().st_mtime < web_png.stat().st_mtime:
+            shutil.copy2(web_png, png_path)
+        return png_path
+
     if png_path.exists():
         return png_path
 
@@ -141,8 +151,14 @@ def apply_template(sections: list, metadata: dict, slide_name: str = "") -> str:
     return html
 
 
-def convert_tex_to_revealjs(tex_file: Path, output_dir: Path) -> Path:
-    """Convert a single .tex file to enhanced Reveal.js HTML."""
+def convert_tex_to_revealjs(tex_file: Path, output_dir: Path, cache_stats: dict = None) -> Path:
+    """Convert a single .tex file to enhanced Reveal.js HTML.
+
+    Args:
+        tex_file: Deck source
+        output_dir: Directory for the HTML file
+        cache_stats: Counts of parse cache "hits" and "misses" to update
+    """
     output_html = output_dir / f"{tex_file.stem}.html"
     slide_name = tex_file.stem  # e.g., "L01_overview"
 
@@ -153,6 +169,8 @@ def convert_tex_to_revealjs(tex_file: Path, output_dir: Path) -> Path:
         # Step 2: Parse .tex with custom parser (no Pandoc needed)
         parser = BeamerParser(tex_file, chart_map)
         sections, metadata = parser.parse()
+        if cache_stats is not None:
+            cache_stats["hits" if parser.cache_hit else "misses"] += 1
 
         if not sections:
             print(f"  WARNING: No sections extracted from {tex_file.name}")
@@ -165,7 +183,8 @@ def convert_tex_to_revealjs(tex_file: Path, output_dir: Path) -> Path:
         output_html.write_text(final_html, encoding='utf-8')
 
         charts_info = f", {len(chart_map)} charts" if chart_map else ""
-        print(f"  OK: {tex_file.name} -> {output_html.name} ({len(sections)} slides{charts_info})")
+        cache_info = ", cached parse" if parser.cache_hit else ""
+        print(f"  OK: {tex_file.name} -> {output_html.name} ({len(sections)} slides{charts_info}{cache_info})")
         return output_html
 
     except Exception as e:
@@ -217,9 +236,10 @@ def convert_all():
 
     converted = []
     failed = []
+    cache_stats = {"hits": 0, "misses": 0}
 
     for tex_file in tex_files:
-        result = convert_tex_to_revealjs(tex_file, SLIDES_OUT)
+        result = convert_tex_to_revealjs(tex_file, SLIDES_OUT, cache_stats)
         if result:
             converted.append(result)
         else:
@@ -228,6 +248,9 @@ def convert_all():
     print(f"\n{'='*50}")
     print(f"Converted: {len(converted)}")
     print(f"Failed: {len(failed)}")
+    parsed = cache_stats["hits"] + cache_stats["misses"]
+    if parsed:
+        print(f"Parse cache: {cache_stats['hits']}/{parsed} hits ({100 * cache_stats['hits'] / parsed:.0f}%)")
 
     if failed:
         print("\nFailed files:")
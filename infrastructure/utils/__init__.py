@@ -1,10 +1,22 @@
 """Utility modules for course infrastructure."""
 from .retry_strategy import RetryStrategy
-from .hash_utils import compute_file_hash, compute_string_hash, verify_hash
+from .hash_utils import compute_file_hash, compute_string_hash, compute_pdf_object_hash, verify_hash
+from .build_cache import BuildCache, atomic_copy
+from .chart_index import load_chart_index, index_chart
+from .job_limits import JobHistory, limited_command, exceeded_memory, crash_signal
 
 __all__ = [
     "RetryStrategy",
     "compute_file_hash",
     "compute_string_hash",
+    "compute_pdf_object_hash",
     "verify_hash",
+    "BuildCache",
+    "atomic_copy",
+    "load_chart_index",
+    "index_chart",
+    "JobHistory",
+    "limited_command",
+    "exceeded_memory",
+    "crash_signal",
 ]
@@ -0,0 +1,78 @@
+"""Content-addressed cache for build artifacts."""
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+CACHE_ROOT = Path(os.environ.get("COURSE_BUILD_CACHE", PROJECT_ROOT / ".build_cache"))
+
+
+class BuildCache:
+    """Store build outputs under a content key.
+
+    Entries live in ``<cache root>/<namespace>/<key[:2]>/<key>/<name>`` so a
+    key always maps to the same files and stale entries are never reused.
+    """
+
+    def __init__(self, namespace: str, root: Optional[Path] = None):
+        self.root = Path(root or CACHE_ROOT) / namespace
+
+    def entry_dir(self, key: str) -> Path:
+        """Directory holding the artifacts stored under *key*."""
+        return self.root / key[:2] / key
+
+    def lookup(self, key: str, name: str) -> Optional[Path]:
+        """Return the stored artifact *name* for *key*, or None."""
+        path = self.entry_dir(key) / name
+        if path.exists() and path.stat().st_size > 0:
+            return path
+        return None
+
+    def store(self, key: str, file_path: Union[str, Path], name: Optional[str] = None) -> Path:
+        """Copy *file_path* into the cache under *key*.
+
+        Args:
+            key: Content key
+            file_path: Artifact to store
+            name: Stored file name (defaults to the artifact's name)
+
+        Returns:
+            Path of the stored copy
+        """
+        file_path = Path(file_path)
+        dest = self.entry_dir(key) / (name or file_path.name)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        atomic_copy(file_path, dest)
+        return dest
+
+    def restore(self, key: str, dest: Union[str, Path], name: Optional[str] = None) -> bool:
+        """Copy the artifact stored under *key* to *dest*.
+
+        Returns:
+            True if a stored artifact was restored
+        """
+        dest = Path(dest)
+        cached = self.lookup(key, name or dest.name)
+        if cached is None:
+            return False
+        atomic_copy(cached, dest)
+        return True
+
+    def clear(self) -> None:
+        """Remove every entry in this namespace."""
+        if self.root.exists():
+            shutil.rmtree(self.root)
+
+
+def atomic_copy(src: Union[str, Path], dest: Union[str, Path]) -> None:
+    """Copy *src* to *dest* so readers never see a partial file."""
+    src, dest = Path(src), Path(dest)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
@@ -0,0 +1,180 @@
+"""Static index of chart scripts, extracted with ast.
+
+Each ``slides/*/*/chart.py`` is parsed (never executed) for its
+``CHART_METADATA`` dict, the modules it imports, the data files it reads
+and the files it writes. The index is cached in the build cache; an entry
+is re-parsed only when its script's mtime/size and content hash change.
+"""
+import ast
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .build_cache import CACHE_ROOT
+from .hash_utils import compute_file_hash
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+INDEX_FILE = "chart_index.json"
+
+# Bump when the extracted fields change so old entries are re-parsed
+INDEX_VERSION = 1
+
+DATA_EXTENSIONS = (".csv", ".parquet", ".xlsx", ".json", ".npz", ".pkl")
+OUTPUT_EXTENSIONS = (".pdf", ".png", ".svg", ".webp")
+SAVE_FUNCTIONS = {"savefig", "save_chart"}
+
+# Below this many stale scripts, parsing inline beats starting processes
+PARALLEL_THRESHOLD = 16
+
+
+def load_chart_index(refresh: bool = True, jobs: int = None) -> Dict[str, Dict]:
+    """Return the chart index keyed by script path relative to the project root.
+
+    Args:
+        refresh: Re-parse scripts that changed since the index was written
+        jobs: Worker processes used for re-parsing (None for CPU count)
+
+    Returns:
+        Mapping of ``slides/.../chart.py`` to its entry (metadata, imports,
+        datasets, outputs, error)
+    """
+    index_path = CACHE_ROOT / INDEX_FILE
+    cached = _read_index(index_path)
+    if not refresh:
+        return cached
+
+    entries = {}
+    stale = []
+    touched = False
+    for script in sorted((PROJECT_ROOT / "slides").glob("*/*/chart.py")):
+        rel = script.relative_to(PROJECT_ROOT).as_posix()
+        stat = script.stat()
+        entry = cached.get(rel)
+        if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            entries[rel] = entry
+            continue
+
+        file_hash = compute_file_hash(script)
+        if entry and entry["hash"] == file_hash:
+            # Touched but unchanged: keep the parse, update the stamp
+            entry.update(mtime=stat.st_mtime, size=stat.st_size)
+            entries[rel] = entry
+            touched = True
+        else:
+            stale.append(rel)
+        entries.setdefault(rel, {"mtime": stat.st_mtime, "size": stat.st_size, "hash": file_hash})
+
+    if stale:
+        if len(stale) < PARALLEL_THRESHOLD:
+            parsed = [index_chart(PROJECT_ROOT / rel) for rel in stale]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+                parsed = list(pool.map(index_chart, [PROJECT_ROOT / rel for rel in stale],
+                                       chunksize=8))
+        for rel, fields in zip(stale, parsed):
+            entries[rel].update(fields)
+
+    if stale or touched or entries.keys() != cached.keys():
+        _write_index(index_path, entries)
+    return entries
+
+
+def index_chart(script_path: Path) -> Dict:
+    """Extract metadata, imports, datasets and outputs from one chart script."""
+    fields = {"metadata": None, "imports": [], "datasets": [], "outputs": [], "error": None}
+    try:
+        tree = ast.parse(Path(script_path).read_text(encoding="utf-8"), filename=str(script_path))
+    except (SyntaxError, UnicodeDecodeError, OSError) as e:
+        fields["error"] = f"{type(e).__name__}: {e}"
+        return fields
+
+    imports = set()
+    datasets = set()
+    outputs = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            imports.add(node.module)
+        elif isinstance(node, ast.Call) and _call_name(node) in SAVE_FUNCTIONS:
+            names = _string_constants(node.args + [kw.value for kw in node.keywords])
+            written = [n for n in names if n.lower().endswith(OUTPUT_EXTENSIONS)]
+            if not written and _call_name(node) == "save_chart":
+                written = ["chart.pdf"]  # save_chart defaults to chart.pdf
+            outputs.update(Path(n).name for n in written)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if node.value.lower().endswith(DATA_EXTENSIONS):
+                datasets.add(Path(node.value).name)
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "CHART_METADATA" for t in node.targets
+        ):
+            fields["metadata"] = _literal_dict(node.value)
+
+    fields["imports"] = sorted(imports)
+    fields["datasets"] = sorted(datasets)
+    fields["outputs"] = sorted(outputs)
+    return fields
+
+
+def _call_name(node: ast.Call) -> Optional[str]:
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    if isinstance(func, ast.Name):
+        return func.id
+    return None
+
+
+def _string_constants(nodes: List[ast.AST]) -> List[str]:
+    """All string literals inside *nodes* (e.g. in ``Path(...) / 'chart.pdf'``)."""
+    return [
+        sub.value
+        for node in nodes
+        for sub in ast.walk(node)
+        if isinstance(sub, ast.Constant) and isinstance(sub.value, str)
+    ]
+
+
+def _literal_dict(node: ast.AST) -> Optional[Dict]:
+    """Evaluate a dict literal, keeping only the keys whose values are literals."""
+    try:
+        value = ast.literal_eval(node)
+        return value if isinstance(value, dict) else None
+    except (ValueError, TypeError, SyntaxError):
+        pass
+    if not isinstance(node, ast.Dict):
+        return None
+
+    result = {}
+    for key, value in zip(node.keys, node.values):
+        try:
+            result[ast.literal_eval(key)] = ast.literal_eval(value)
+        except (ValueError, TypeError, SyntaxError):
+            continue
+    return result
+
+
+def _read_index(index_path: Path) -> Dict[str, Dict]:
+    if not index_path.exists():
+        return {}
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if data.get("version") != INDEX_VERSION:
+        return {}
+    return data.get("charts", {})
+
+
+def _write_index(index_path: Path, entries: Dict[str, Dict]) -> None:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": INDEX_VERSION, "charts": entries}, f, indent=2)
+    os.replace(tmp, index_path)
@@ -1,7 +1,7 @@
 """Hash utilities for file integrity verification."""
 import hashlib
 from pathlib import Path
-from typing import Union
+from typing import Dict, Optional, Union
 
 
 def compute_file_hash(file_path: Union[str, Path], algorithm: str = "sha256") -> str:
@@ -53,6 +53,62 @@ def compute_string_hash(content: str, algorithm: str = "sha256") -> str:
     return hasher.hexdigest()
 
 
+def compute_pdf_object_hash(obj, memo: Optional[Dict] = None) -> str:
+    """Compute a content hash of a pikepdf object and everything it references.
+
+    Object numbers and stream lengths are ignored, so equal content hashes
+    equal whichever file or object it comes from. /Parent links are skipped
+    (they point back up the page tree and say nothing about content).
+
+    Args:
+        obj: pikepdf object
+        memo: Hashes of indirect objects already visited (shared between
+            calls to hash several objects of one PDF quickly)
+
+    Returns:
+        Hexadecimal hash string
+    """
+    return _pdf_object_hash(obj, {} if memo is None else memo, frozenset())
+
+
+def _pdf_object_hash(obj, memo: Dict, stack: frozenset) -> str:
+    import pikepdf
+
+    objgen = obj.objgen if getattr(obj, "is_indirect", False) else None
+    if objgen in memo:
+        return memo[objgen]
+    if objgen is not None and objgen in stack:
+        return "cycle"
+    if objgen is not None:
+        stack = stack | {objgen}
+
+    hasher = hashlib.sha256()
+    if isinstance(obj, pikepdf.Stream):
+        hasher.update(b"stream")
+        hasher.update(obj.read_raw_bytes())
+        items = [(k, v) for k, v in obj.items() if k != "/Length"]
+    elif isinstance(obj, pikepdf.Dictionary):
+        hasher.update(b"dict")
+        items = list(obj.items())
+    elif isinstance(obj, pikepdf.Array):
+        hasher.update(b"array")
+        items = list(enumerate(obj))
+    else:
+        hasher.update(repr(obj).encode("utf-8", "replace"))
+        items = []
+
+    for k, v in sorted(items, key=lambda item: str(item[0])):
+        if k == "/Parent":
+            continue
+        hasher.update(str(k).encode("utf-8", "replace"))
+        hasher.update(_pdf_object_hash(v, memo, stack).encode("ascii"))
+
+    value = hasher.hexdigest()
+    if objgen is not None:
+        memo[objgen] = value
+    return value
+
+
 def verify_hash(
     file_path: Union[str, Path],
     expected_hash: str,
@@ -0,0 +1,191 @@
+"""Per-job time and memory limits for build subprocesses.
+
+Timeouts are derived from each job's recorded durations (95th percentile
+times a safety factor, clamped to a sane range) so slow but healthy jobs
+are not killed while hung ones are stopped early. Memory is capped by
+starting jobs through a small launcher that calls ``resource.setrlimit``
+and then execs the job, so nothing runs between fork and exec in the
+(multi-threaded) build process.
+"""
+import json
+import math
+import os
+import shutil
+import signal
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .build_cache import CACHE_ROOT
+
+HISTORY_FILE = "job_history.json"
+
+# Timeout used until a job has enough history
+DEFAULT_TIMEOUT = 120
+MIN_TIMEOUT = 30
+MAX_TIMEOUT = 900
+TIMEOUT_FACTOR = float(os.environ.get("COURSE_TIMEOUT_FACTOR", 3.0))
+MIN_SAMPLES = 3
+MAX_SAMPLES = 20
+
+# Cap per job in MB (0 disables, the default). It limits virtual address
+# space (RLIMIT_AS), not resident memory: numpy/OpenBLAS and matplotlib
+# reserve far more address space than they use, growing with the number
+# of threads, so set it well above the real footprint of the largest job.
+MAX_RSS_MB = float(os.environ.get("COURSE_MAX_RSS_MB", 0))
+
+# stderr fragments left behind by allocations failing under the cap
+# (matched case-insensitively). Under RLIMIT_AS a job rarely dies with a
+# plain MemoryError: loading an extension fails in dlopen and surfaces as
+# ImportError, C extensions report the failed malloc in their own words,
+# and some return NULL without setting an exception (SystemError).
+_MEMORY_ERRORS = (
+    "MemoryError",
+    "std::bad_alloc",
+    "Cannot allocate memory",
+    "out of memory",
+    "failed to map segment from shared object",
+    "Memory allocation still failed",
+    "Unable to allocate",
+    "error return without exception set",
+    "returned NULL without setting an exception",
+)
+# Other signals (SIGSEGV, SIGABRT, ...) are crashes, see crash_signal()
+_KILL_SIGNALS = {getattr(signal, name) for name in ("SIGKILL",) if hasattr(signal, name)}
+
+# Run as ``python -c _LAUNCHER <limit bytes> <command...>``: cap the address
+# space, then replace the launcher with the job
+_LAUNCHER = (
+    "import os, resource, sys\n"
+    "limit = int(sys.argv[1])\n"
+    "soft, hard = resource.getrlimit(resource.RLIMIT_AS)\n"
+    "if hard != resource.RLIM_INFINITY:\n"
+    "    limit = min(limit, hard)\n"
+    "resource.setrlimit(resource.RLIMIT_AS, (limit, hard))\n"
+    "os.execvp(sys.argv[2], sys.argv[2:])\n"
+)
+
+
+class JobHistory:
+    """Recorded durations of successful jobs, keyed by job name.
+
+    Each namespace (``charts``, ``latex``) keeps the most recent
+    durations per job; ``timeout_for`` turns them into a limit.
+    """
+
+    def __init__(self, namespace: str, path: Optional[Path] = None):
+        self.namespace = namespace
+        self.path = Path(path or CACHE_ROOT / HISTORY_FILE)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, List[float]] = self._load().get(namespace, {})
+
+    def timeout_for(self, job: str, default: float = DEFAULT_TIMEOUT) -> float:
+        """Timeout in seconds for *job*: p95 of its history times the factor.
+
+        Args:
+            job: Job name (usually a path relative to the project root)
+            default: Timeout used while the job has too little history
+
+        Returns:
+            Timeout in seconds
+        """
+        with self._lock:
+            samples = sorted(self._jobs.get(job, []))
+        if len(samples) < MIN_SAMPLES:
+            return default
+        p95 = samples[min(len(samples) - 1, math.ceil(0.95 * len(samples)) - 1)]
+        return round(min(MAX_TIMEOUT, max(MIN_TIMEOUT, p95 * TIMEOUT_FACTOR)), 1)
+
+    def record(self, job: str, duration: float) -> None:
+        """Add the duration of a successful run of *job*."""
+        with self._lock:
+            samples = self._jobs.setdefault(job, [])
+            samples.append(round(duration, 3))
+            del samples[:-MAX_SAMPLES]
+
+    def save(self) -> None:
+        """Write this namespace back, keeping the others on disk."""
+        with self._lock:
+            data = self._load()
+            data[self.namespace] = self._jobs
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+
+    def _load(self) -> Dict:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+
+def apply_memory_limit(max_rss_mb: Optional[float] = None) -> None:
+    """Cap the address space of the current process.
+
+    RLIMIT_RSS is not enforced by Linux, so the cap is applied to
+    RLIMIT_AS; allocations beyond it fail instead of swapping the host.
+    """
+    limit_mb = MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+    if not limit_mb or resource is None:
+        return
+    limit = int(limit_mb * 1024 * 1024)
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def limited_command(command: List[str], max_rss_mb: Optional[float] = None) -> List[str]:
+    """Wrap *command* so it runs under the memory cap.
+
+    The returned command starts a launcher that sets RLIMIT_AS and execs
+    *command*; it is returned unchanged when the cap is off or unsupported.
+
+    Raises:
+        FileNotFoundError: If the program of *command* is not on PATH (as
+            subprocess would, since the launcher cannot report it)
+    """
+    limit_mb = MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+    if not limit_mb or resource is None:
+        return command
+    program = shutil.which(command[0])
+    if program is None:
+        raise FileNotFoundError(f"No such file or directory: '{command[0]}'")
+    return [sys.executable, "-c", _LAUNCHER, str(int(limit_mb * 1024 * 1024)), program, *command[1:]]
+
+
+def exceeded_memory(returncode: int, stderr: str) -> bool:
+    """Whether a failed job looks like it hit the memory cap.
+
+    Only meaningful when the job ran under a cap; callers check that first.
+    """
+    if returncode == 0:
+        return False
+    if returncode < 0 and -returncode in _KILL_SIGNALS:
+        return True
+    stderr = (stderr or "").lower()
+    return any(marker.lower() in stderr for marker in _MEMORY_ERRORS)
+
+
+def crash_signal(returncode: int) -> Optional[str]:
+    """Name of the signal that ended a job (e.g. "SIGSEGV"), or None if it exited."""
+    if returncode >= 0:
+        return None
+    try:
+        return signal.Signals(-returncode).name
+    except ValueError:
+        return f"signal {-returncode}"
@@ -0,0 +1,205 @@
+"""Chart regression checks using perceptual image hashes.
+
+Each chart.pdf is rasterized in grayscale at low DPI with pdftoppm and
+reduced to a difference hash (dHash). Hashes are compared against a
+stored baseline; charts whose hash moved more than a threshold number of
+bits are reported as drifted. Rasterization runs in parallel, so a full
+check takes a few seconds.
+"""
+import json
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+BASELINE_PATH = Path(__file__).parent / "chart_baselines.json"
+
+RASTER_DPI = 30
+HASH_SIZE = 16  # 16x16 = 256-bit hash
+DEFAULT_THRESHOLD = 12  # bits out of 256
+
+
+def check_chart_regressions(
+    manifest: dict,
+    update_baseline: bool = False,
+    threshold: int = DEFAULT_THRESHOLD,
+    jobs: int = None,
+    prune_baseline: bool = False
+) -> bool:
+    """
+    Compare chart PDFs against their baseline perceptual hashes.
+
+    Args:
+        manifest: Course manifest
+        update_baseline: Store the current hashes in the baseline. Charts
+            without a current hash keep their stored one, and nothing is
+            saved if any chart failed to rasterize.
+        threshold: Maximum Hamming distance (bits) before a chart counts as drifted
+        jobs: Number of charts rasterized concurrently (None for CPU count)
+        prune_baseline: With update_baseline, also drop [GONE] entries
+
+    Returns:
+        True if no chart drifted beyond the threshold
+    """
+    pdfs = []
+    for topic in manifest["topics"]:
+        for chart in topic.get("assets", {}).get("charts", []):
+            chart_file = chart.get("file", "")
+            if not chart_file:
+                continue
+            pdf_path = PROJECT_ROOT / Path(chart_file).parent / "chart.pdf"
+            if pdf_path.exists():
+                pdfs.append(pdf_path)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs or os.cpu_count() or 1)) as pool:
+        hashes = list(pool.map(_hash_or_error, pdfs))
+
+    baseline = _load_baseline()
+    stored = baseline.get("charts", {})
+
+    current = {}
+    drifted = 0
+    failed = 0
+    for pdf_path, (phash, error) in zip(pdfs, hashes):
+        rel = pdf_path.relative_to(PROJECT_ROOT).as_posix()
+        name = pdf_path.parent.name
+
+        if error:
+            print(f"  [FAIL] {name} - {error}")
+            failed += 1
+            continue
+
+        current[rel] = phash
+        if rel not in stored:
+            print(f"  [NEW]  {name}")
+            continue
+
+        distance = hamming_distance(phash, stored[rel])
+        if distance > threshold:
+            print(f"  [DRIFT] {name} - {distance} bits changed (threshold {threshold})")
+            drifted += 1
+
+    for rel in sorted(set(stored) - set(current)):
+        print(f"  [GONE] {Path(rel).parent.name} - no chart.pdf")
+
+    print(f"  Checked {len(current)} charts: {drifted} drifted, "
+          f"{len(set(current) - set(stored))} without baseline")
+
+    if update_baseline:
+        # A chart that failed to rasterize would otherwise lose its baseline
+        if failed:
+            print(f"  [FAIL] Baseline not updated: {failed} chart(s) could not be rasterized")
+            return False
+        gone = set(stored) - set(current)
+        charts = dict(current) if prune_baseline else {**stored, **current}
+        _save_baseline(charts)
+        print(f"  Baseline updated ({len(charts)} charts)")
+        if gone and not prune_baseline:
+            print(f"  Kept {len(gone)} [GONE] baseline(s); --prune-baseline drops them")
+        return True
+
+    return drifted == 0 and failed == 0
+
+
+def compute_chart_hash(pdf_path: Path, dpi: int = RASTER_DPI) -> str:
+    """Perceptual dHash of the first page of *pdf_path* as a hex string.
+
+    Raises:
+        RuntimeError: If the PDF cannot be rasterized
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        out_base = Path(tmp) / "page"
+        try:
+            result = subprocess.run(
+                ["pdftoppm", "-gray", "-r", str(dpi), "-f", "1", "-l", "1",
+                 "-singlefile", str(pdf_path), str(out_base)],
+                capture_output=True,
+                timeout=30
+            )
+        except FileNotFoundError:
+            raise RuntimeError("pdftoppm not found (install poppler)")
+        pgm_path = out_base.with_suffix(".pgm")
+        if result.returncode != 0 or not pgm_path.exists():
+            raise RuntimeError("rasterization failed")
+        width, height, pixels = _read_pgm(pgm_path)
+
+    return _dhash(width, height, pixels)
+
+
+def hamming_distance(hash_a: str, hash_b: str) -> int:
+    """Number of differing bits between two hex hashes."""
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count("1")
+
+
+def _hash_or_error(pdf_path: Path) -> Tuple[Optional[str], Optional[str]]:
+    try:
+        return compute_chart_hash(pdf_path), None
+    except (RuntimeError, subprocess.TimeoutExpired, ValueError) as e:
+        return None, str(e) or "rasterization timed out"
+
+
+def _read_pgm(pgm_path: Path) -> Tuple[int, int, bytes]:
+    """Read a binary (P5) 8-bit PGM file."""
+    data = pgm_path.read_bytes()
+    fields = []
+    pos = 0
+    while len(fields) < 4:
+        # Skip whitespace and comments between header fields
+        while data[pos:pos + 1].isspace():
+            pos += 1
+        if data[pos:pos + 1] == b"#":
+            pos = data.index(b"\n", pos) + 1
+            continue
+        start = pos
+        while not data[pos:pos + 1].isspace():
+            pos += 1
+        fields.append(data[start:pos])
+    magic, width, height, maxval = fields[0], int(fields[1]), int(fields[2]), int(fields[3])
+    if magic != b"P5" or maxval > 255:
+        raise ValueError(f"Unsupported PGM format in {pgm_path.name}")
+    pixels = data[pos + 1:pos + 1 + width * height]
+    return width, height, pixels
+
+
+def _dhash(width: int, height: int, pixels: bytes) -> str:
+    """Difference hash over a (HASH_SIZE+1) x HASH_SIZE box-averaged grid."""
+    cols, rows = HASH_SIZE + 1, HASH_SIZE
+    grid = []
+    for r in range(rows):
+        y0, y1 = r * height // rows, max((r + 1) * height // rows, r * height // rows + 1)
+        row = []
+        for c in range(cols):
+            x0, x1 = c * width // cols, max((c + 1) * width // cols, c * width // cols + 1)
+            total = 0
+            for y in range(y0, y1):
+                line = pixels[y * width + x0:y * width + x1]
+                total += sum(line)
+            row.append(total / ((y1 - y0) * (x1 - x0)))
+        grid.append(row)
+
+    bits = 0
+    for row in grid:
+        for c in range(HASH_SIZE):
+            bits = (bits << 1) | (1 if row[c] > row[c + 1] else 0)
+    return f"{bits:0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+def _load_baseline() -> Dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_baseline(charts: Dict[str, str]) -> None:
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump({
+            "updated": datetime.now().isoformat(),
+            "dpi": RASTER_DPI,
+            "hash_size": HASH_SIZE,
+            "charts": dict(sorted(charts.items())),
+        }, f, indent=2)
@@ -3,21 +3,43 @@ import subprocess
 import sys
 from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).parent.parent.parent
+from builders.chart_worker import ChartWorkerPool
+from utils.job_limits import MAX_RSS_MB, JobHistory, crash_signal, exceeded_memory, limited_command
 
+from .chart_regression import DEFAULT_THRESHOLD, check_chart_regressions
 
-def validate_charts(manifest: dict, regenerate: bool = False) -> bool:
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+RUNNER_SCRIPT = PROJECT_ROOT / "infrastructure" / "builders" / "chart_runner.py"
+
+
+def validate_charts(
+    manifest: dict,
+    regenerate: bool = False,
+    warm: bool = False,
+    regression: bool = False,
+    update_baseline: bool = False,
+    threshold: int = DEFAULT_THRESHOLD,
+    prune_baseline: bool = False
+) -> bool:
     """
     Validate chart scripts and PDFs.
 
     Args:
         manifest: Course manifest
         regenerate: If True, regenerate all charts
+        warm: Regenerate charts in a warm worker process
+        regression: Compare chart output against baseline perceptual hashes
+        update_baseline: Store current chart hashes as the new baseline
+        threshold: Bits a chart hash may change before it counts as drifted
+        prune_baseline: With update_baseline, drop baselines of charts
+            that no longer have a chart.pdf
 
     Returns:
         True if all validations pass
     """
     all_passed = True
+    workers = ChartWorkerPool(memory_limit_mb=MAX_RSS_MB) if warm else None
+    history = JobHistory("charts")
 
     for topic in manifest["topics"]:
         charts = topic.get("assets", {}).get("charts", [])
@@ -39,7 +61,7 @@ def validate_charts(manifest: dict, regenerate: bool = False) -> bool:
 
             if regenerate or not pdf_path.exists():
                 # Try to run the chart script
-                passed = _run_chart_script(chart_path)
+                passed = _run_chart_script(chart_path, workers, history)
                 if not passed:
                     all_passed = False
             else:
@@ -50,24 +72,53 @@ def validate_charts(manifest: dict, regenerate: bool = False) -> bool:
                     print(f"  [FAIL] {chart['id']} - PDF is empty")
                     all_passed = False
 
+    if workers is not None:
+        workers.close()
+
+    if regression or update_baseline:
+        print("  Checking chart output against baseline...")
+        if not check_chart_regressions(
+            manifest, update_baseline, threshold, prune_baseline=prune_baseline
+        ):
+            all_passed = False
+
     return all_passed
 
 
-def _run_chart_script(script_path: Path) -> bool:
+def _run_chart_script(
+    script_path: Path,
+    workers: ChartWorkerPool = None,
+    history: JobHistory = None
+) -> bool:
     """Run a chart.py script and verify PDF output."""
     print(f"  Running {script_path.parent.name}/chart.py...")
 
+    job = script_path.relative_to(PROJECT_ROOT).as_posix()
+    timeout = history.timeout_for(job, default=60) if history else 60
+
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            cwd=script_path.parent,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
+        if workers is not None:
+            result = workers.run(script_path, timeout=timeout)
+        else:
+            result = subprocess.run(
+                limited_command([sys.executable, str(RUNNER_SCRIPT), str(script_path)]),
+                cwd=script_path.parent,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+
+        if MAX_RSS_MB and exceeded_memory(result.returncode, result.stderr):
+            print(f"    [KILLED] Exceeded memory limit ({MAX_RSS_MB:.0f} MB)")
+            return False
+
+        if crash_signal(result.returncode):
+            print(f"    [FAIL] Script crashed ({crash_signal(result.returncode)})")
+            return False
 
         if result.returncode != 0:
-            print(f"    [FAIL] Script error: {result.stderr[:200]}")
+            errors = result.stderr.strip().splitlines() if result.stderr else []
+            print(f"    [FAIL] Script error: {errors[-1] if errors else 'Unknown error'}")
             return False
 
         # Check if PDF was created
@@ -80,7 +131,7 @@ def _run_chart_script(script_path: Path) -> bool:
             return False
 
     except subprocess.TimeoutExpired:
-        print(f"    [FAIL] Script timed out")
+        print(f"    [KILLED] Exceeded time limit ({timeout:.0f}s)")
         return False
     except Exception as e:
         print(f"    [FAIL] Error: {e}")
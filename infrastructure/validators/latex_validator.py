@@ -1,53 +1,86 @@
 """LaTeX/Beamer slide validation."""
-import subprocess
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import List
+
+from builders.slide_builder import CompileService, get_topic_dir
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
 
-def validate_latex(manifest: dict, strict: bool = False) -> bool:
+def validate_latex(
+    manifest: dict,
+    strict: bool = False,
+    jobs: int = None,
+    service: CompileService = None
+) -> bool:
     """
     Validate LaTeX files.
 
+    Source lint runs in parallel across files. Compiles go through the
+    slide builder's CompileService, so decks compiled by ``build slides``
+    with unchanged inputs are not compiled again (and the other way round).
+
     Args:
         manifest: Course manifest
         strict: If True, fail on warnings (overflow)
+        jobs: Number of files linted / compiled concurrently (None for CPU count)
+        service: Compile service to share with a build (None for a new one)
 
     Returns:
         True if all validations pass
     """
-    all_passed = True
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    tex_files = []
 
     for topic in manifest["topics"]:
-        topic_dir = PROJECT_ROOT / f"slides/{topic['id']}_{topic['title'].replace(' ', '_').replace('&', '').replace('/', '_')}"
+        topic_dir = get_topic_dir(topic)
+
+        # Check overview and deepdive slides
+        for variant in ["overview", "deepdive"]:
+            tex_path = topic_dir / f"{topic['id']}_{variant}.tex"
+            if tex_path.exists():
+                tex_files.append(tex_path)
+            else:
+                print(f"  [SKIP] {tex_path.name} - not found")
+
+    if not tex_files:
+        return True
+
+    if jobs > 1 and len(tex_files) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tex_files))) as pool:
+            lint_results = list(pool.map(lint_tex_file, tex_files))
+    else:
+        lint_results = [lint_tex_file(tex_path) for tex_path in tex_files]
+
+    service = service or CompileService()
+    all_passed = True
 
-        # Check overview slides
-        overview_tex = topic_dir / f"{topic['id']}_overview.tex"
-        if overview_tex.exists():
-            passed = _validate_tex_file(overview_tex, strict)
-            if not passed:
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # In strict mode a file with source issues fails without compiling
+        futures = [
+            None if strict and issues else pool.submit(service.compile, tex_path)
+            for tex_path, issues in zip(tex_files, lint_results)
+        ]
+
+        for tex_path, issues, future in zip(tex_files, lint_results, futures):
+            print(f"  Checking {tex_path.name}...")
+            for issue in issues:
+                print(f"    [WARN] {issue}")
+            if future is None:
                 all_passed = False
-        else:
-            print(f"  [SKIP] {overview_tex.name} - not found")
-
-        # Check deepdive slides
-        deepdive_tex = topic_dir / f"{topic['id']}_deepdive.tex"
-        if deepdive_tex.exists():
-            passed = _validate_tex_file(deepdive_tex, strict)
-            if not passed:
+                continue
+            if not _report_compile(future.result(), strict):
                 all_passed = False
-        else:
-            print(f"  [SKIP] {deepdive_tex.name} - not found")
 
+    service.save()
     return all_passed
 
 
-def _validate_tex_file(tex_path: Path, strict: bool) -> bool:
-    """Validate a single TeX file."""
-    print(f"  Checking {tex_path.name}...")
-
-    # Check for common issues in source
+def lint_tex_file(tex_path: Path) -> List[str]:
+    """Check a TeX file's source line by line for common issues."""
     issues = []
     with open(tex_path, "r", encoding="utf-8") as f:
         content = f.read()
@@ -66,44 +99,29 @@ def _validate_tex_file(tex_path: Path, strict: bool) -> bool:
             if "\\includegraphics" in line and "width=" not in line:
                 issues.append(f"Line {i}: includegraphics without width specification")
 
-    if issues:
-        for issue in issues:
-            print(f"    [WARN] {issue}")
-        if strict:
-            return False
-
-    # Try to compile (if pdflatex available)
-    try:
-        result = subprocess.run(
-            ["pdflatex", "-interaction=nonstopmode", "-halt-on-error", str(tex_path)],
-            cwd=tex_path.parent,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-
-        # Check for errors
-        if result.returncode != 0:
-            print(f"    [FAIL] Compilation failed")
-            # Extract error message
-            error_match = re.search(r"^!.*$", result.stdout, re.MULTILINE)
-            if error_match:
-                print(f"    Error: {error_match.group()}")
-            return False
-
-        # Check for overflow warnings
-        if strict:
-            overflow_warnings = re.findall(r"Overfull \\[hv]box", result.stdout)
-            if overflow_warnings:
-                print(f"    [FAIL] {len(overflow_warnings)} overflow warnings")
-                return False
-
-        print(f"    [PASS]")
-        return True
+    return issues
+
 
-    except FileNotFoundError:
+def _report_compile(result: dict, strict: bool) -> bool:
+    """Print the outcome of a deck compile; returns whether it passes."""
+    if result.get("tool_missing"):
         print(f"    [SKIP] pdflatex not found")
         return True  # Can't validate, assume OK
-    except subprocess.TimeoutExpired:
+
+    if result.get("killed") == "time":
         print(f"    [FAIL] Compilation timed out")
         return False
+
+    if not result["passed"]:
+        print(f"    [FAIL] Compilation failed")
+        if result.get("error"):
+            print(f"    Error: {result['error']}")
+        return False
+
+    # Check for overflow warnings
+    if strict and result.get("overfull"):
+        print(f"    [FAIL] {result['overfull']} overflow warnings")
+        return False
+
+    print(f"    [PASS]{' (unchanged since last compile)' if result.get('up_to_date') else ''}")
+    return True
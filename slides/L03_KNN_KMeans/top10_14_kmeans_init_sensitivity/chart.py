@@ -6,7 +6,7 @@ from sklearn.cluster import KMeans
 from sklearn.datasets import make_blobs
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'templates'))
-from chart_style import apply_style, COLORS, MLPURPLE, MLBLUE, MLORANGE, MLGREEN, MLRED, MLLAVENDER
+from chart_style import apply_style, parallel_trials, COLORS, MLPURPLE, MLBLUE, MLORANGE, MLGREEN, MLRED, MLLAVENDER
 apply_style()
 
 CHART_METADATA = {
@@ -18,17 +18,17 @@ CHART_METADATA = {
 
 X, _ = make_blobs(n_samples=500, centers=5, random_state=42)
 
-inertias_random = []
-inertias_pp = []
 
-for i in range(50):
-    km_rand = KMeans(n_clusters=5, init='random', n_init=1, random_state=i)
-    km_rand.fit(X)
-    inertias_random.append(km_rand.inertia_)
+def init_trial(rng):
+    """Fit one random and one k-means++ initialization from the same seed."""
+    seed = int(rng.integers(2**31 - 1))
+    km_rand = KMeans(n_clusters=5, init='random', n_init=1, random_state=seed).fit(X)
+    km_pp = KMeans(n_clusters=5, init='k-means++', n_init=1, random_state=seed).fit(X)
+    return km_rand.inertia_, km_pp.inertia_
 
-    km_pp = KMeans(n_clusters=5, init='k-means++', n_init=1, random_state=i)
-    km_pp.fit(X)
-    inertias_pp.append(km_pp.inertia_)
+
+# KMeans releases the GIL (and uses OpenMP, which is not fork-safe), so use threads
+inertias_random, inertias_pp = zip(*parallel_trials(init_trial, 50, seed=42, backend='thread'))
 
 fig, ax = plt.subplots(figsize=(10, 6))
 
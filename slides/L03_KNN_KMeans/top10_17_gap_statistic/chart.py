@@ -6,7 +6,7 @@ from sklearn.cluster import KMeans
 from sklearn.datasets import make_blobs
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'templates'))
-from chart_style import apply_style, COLORS, MLPURPLE, MLBLUE, MLORANGE, MLGREEN, MLRED, MLLAVENDER
+from chart_style import apply_style, cached, parallel_trials, COLORS, MLPURPLE, MLBLUE, MLORANGE, MLGREEN, MLRED, MLLAVENDER
 apply_style()
 
 CHART_METADATA = {
@@ -16,36 +16,42 @@ CHART_METADATA = {
 }
 
 
-X, _ = make_blobs(n_samples=300, centers=4, random_state=42)
+@cached
+def gap_statistic(X, ks, n_refs):
+    """Return gap values and reference std devs for each k (cached on disk)."""
+    log_w_data = []
+    log_w_refs = []
+    log_w_ref_stds = []
 
-ks = range(1, 11)
-n_refs = 20
+    # Bounding box for uniform reference data
+    x_min, x_max = X.min(axis=0), X.max(axis=0)
+
+    for k in ks:
+        km = KMeans(n_clusters=k, random_state=42, n_init=10)
+        km.fit(X)
+        log_w_data.append(np.log(km.inertia_))
+
+        def reference_trial(rng, k=k):
+            X_ref = rng.uniform(x_min, x_max, size=X.shape)
+            km_ref = KMeans(n_clusters=k, random_state=42, n_init=10)
+            km_ref.fit(X_ref)
+            return np.log(km_ref.inertia_)
 
-log_w_data = []
-log_w_refs = []
-log_w_ref_stds = []
+        # One stream per (k, reference); threads since KMeans releases the GIL
+        ref_inertias = parallel_trials(reference_trial, n_refs, seed=(42, k), backend='thread')
 
-# Bounding box for uniform reference data
-x_min, x_max = X.min(axis=0), X.max(axis=0)
+        log_w_refs.append(np.mean(ref_inertias))
+        log_w_ref_stds.append(np.std(ref_inertias))
 
-for k in ks:
-    km = KMeans(n_clusters=k, random_state=42, n_init=10)
-    km.fit(X)
-    log_w_data.append(np.log(km.inertia_))
+    return np.array(log_w_refs) - np.array(log_w_data), np.array(log_w_ref_stds)
 
-    ref_inertias = []
-    for r in range(n_refs):
-        rng = np.random.RandomState(r + k * 100)
-        X_ref = rng.uniform(x_min, x_max, size=X.shape)
-        km_ref = KMeans(n_clusters=k, random_state=42, n_init=10)
-        km_ref.fit(X_ref)
-        ref_inertias.append(np.log(km_ref.inertia_))
 
-    log_w_refs.append(np.mean(ref_inertias))
-    log_w_ref_stds.append(np.std(ref_inertias))
+X, _ = make_blobs(n_samples=300, centers=4, random_state=42)
+
+ks = range(1, 11)
+n_refs = 20
 
-gap = np.array(log_w_refs) - np.array(log_w_data)
-gap_stds = np.array(log_w_ref_stds)
+gap, gap_stds = gap_statistic(X, ks, n_refs)
 
 fig, ax = plt.subplots(figsize=(10, 6))
 
@@ -6,7 +6,7 @@ from sklearn.manifold import TSNE
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'templates'))
-from chart_style import apply_style, COLORS, MLPURPLE, MLBLUE, MLORANGE, MLGREEN, MLRED, MLLAVENDER
+from chart_style import apply_style, cached, COLORS, MLPURPLE, MLBLUE, MLORANGE, MLGREEN, MLRED, MLLAVENDER
 apply_style()
 
 CHART_METADATA = {
@@ -20,15 +20,19 @@ np.random.seed(42)
 
 X, y = make_blobs(n_samples=500, n_features=20, centers=5, cluster_std=1.5, random_state=42)
 
-perplexities = list(range(5, 101, 5))
-kl_divs = []
+@cached
+def final_kl_divergences(X, perplexities):
+    """Fit one t-SNE per perplexity and return the final KL divergences (cached on disk)."""
+    kl_divs = []
+    for p in perplexities:
+        tsne = TSNE(perplexity=p, random_state=42, n_iter=1000)
+        tsne.fit_transform(X)
+        kl_divs.append(tsne.kl_divergence_)
+    return np.array(kl_divs)
 
-for p in perplexities:
-    tsne = TSNE(perplexity=p, random_state=42, n_iter=1000)
-    tsne.fit_transform(X)
-    kl_divs.append(tsne.kl_divergence_)
 
-kl_divs = np.array(kl_divs)
+perplexities = list(range(5, 101, 5))
+kl_divs = final_kl_divergences(X, perplexities)
 min_idx = np.argmin(kl_divs)
 
 fig, ax = plt.subplots()
@@ -4,7 +4,7 @@ import numpy as np
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'templates'))
-from chart_style import apply_style, COLORS, MLPURPLE, MLBLUE, MLORANGE, MLGREEN, MLRED, MLLAVENDER
+from chart_style import apply_style, parallel_trials, COLORS, MLPURPLE, MLBLUE, MLORANGE, MLGREEN, MLRED, MLLAVENDER
 apply_style()
 
 CHART_METADATA = {
@@ -22,31 +22,31 @@ n_runs = 100
 true_means = np.random.randn(n_arms) + np.arange(n_arms) * 0.3
 optimal_reward = true_means.max()
 
-def run_random(n_steps, true_means):
+def run_random(rng, n_steps, true_means):
     regrets = np.zeros(n_steps)
     for t in range(n_steps):
-        action = np.random.randint(len(true_means))
-        reward = true_means[action] + np.random.randn()
+        action = rng.integers(len(true_means))
+        reward = true_means[action] + rng.standard_normal()
         regrets[t] = optimal_reward - true_means[action]
     return np.cumsum(regrets)
 
-def run_epsilon_greedy(n_steps, true_means, epsilon=0.1):
+def run_epsilon_greedy(rng, n_steps, true_means, epsilon=0.1):
     n_arms = len(true_means)
     Q = np.zeros(n_arms)
     N = np.zeros(n_arms)
     regrets = np.zeros(n_steps)
     for t in range(n_steps):
-        if np.random.rand() < epsilon:
-            action = np.random.randint(n_arms)
+        if rng.random() < epsilon:
+            action = rng.integers(n_arms)
         else:
             action = np.argmax(Q)
-        reward = true_means[action] + np.random.randn()
+        reward = true_means[action] + rng.standard_normal()
         N[action] += 1
         Q[action] += (reward - Q[action]) / N[action]
         regrets[t] = optimal_reward - true_means[action]
     return np.cumsum(regrets)
 
-def run_ucb(n_steps, true_means, c=2.0):
+def run_ucb(rng, n_steps, true_means, c=2.0):
     n_arms = len(true_means)
     Q = np.zeros(n_arms)
     N = np.zeros(n_arms)
@@ -57,7 +57,7 @@ def run_ucb(n_steps, true_means, c=2.0):
         else:
             ucb_values = Q + c * np.sqrt(np.log(t) / (N + 1e-10))
             action = np.argmax(ucb_values)
-        reward = true_means[action] + np.random.randn()
+        reward = true_means[action] + rng.standard_normal()
         N[action] += 1
         Q[action] += (reward - Q[action]) / N[action]
         regrets[t] = optimal_reward - true_means[action]
@@ -73,10 +73,9 @@ strategies = [
 fig, ax = plt.subplots(figsize=(10, 6))
 
 for name, func, kwargs, color in strategies:
-    all_regrets = np.zeros((n_runs, n_steps))
-    for run in range(n_runs):
-        np.random.seed(42 + run)
-        all_regrets[run] = func(n_steps, true_means, **kwargs)
+    # Independent runs spread over cores; identical for any worker count
+    all_regrets = np.array(parallel_trials(
+        lambda rng: func(rng, n_steps, true_means, **kwargs), n_runs, seed=42))
     mean_regret = all_regrets.mean(axis=0)
     ax.plot(range(n_steps), mean_regret, color=color, linewidth=2.5, label=name)
 
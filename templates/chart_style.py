@@ -8,10 +8,31 @@ Import from any chart.py via:
     sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'templates'))
     from chart_style import apply_style, COLORS, MLPURPLE, MLBLUE, MLORANGE, MLGREEN, MLRED, MLLAVENDER
     apply_style()
+
+Expensive model fits can be memoized on disk with the ``cached`` decorator
+so that styling-only edits re-render without refitting:
+
+    @cached
+    def fit_models(X, ks):
+        ...
+
+Independent Monte Carlo trials can be spread over cores with
+``parallel_trials``; results do not depend on the number of workers:
+
+    regrets = parallel_trials(lambda rng: simulate(rng), n=100, seed=42)
 """
 
+import functools
+import hashlib
 import inspect
+import io
+import multiprocessing
 import os
+import pickle
+import platform
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
 from pathlib import Path
 
 import matplotlib.pyplot as plt
@@ -43,6 +64,15 @@ RCPARAMS = {
     'scatter.edgecolors': 'white',
 }
 
+# ---------------------------------------------------------------------------
+# Web exports written alongside the PDF by save_chart and, once
+# install_web_export() has run, by any savefig of a chart.pdf
+# ---------------------------------------------------------------------------
+WEB_FORMATS = tuple(f for f in os.environ.get('CHART_WEB_FORMATS', 'png').split(',') if f)
+WEB_DPI = int(os.environ.get('CHART_WEB_DPI', 150))
+
+_web_export = {'installed': False, 'paused': False}
+
 # ---------------------------------------------------------------------------
 # Color palette (canonical values from CLAUDE.md)
 # ---------------------------------------------------------------------------
@@ -71,12 +101,17 @@ def apply_style():
     return COLORS
 
 
-def save_chart(fig, file_path=None):
-    """Save *fig* as PDF and close it.
+def save_chart(fig, file_path=None, web_formats=None, web_dpi=None):
+    """Save *fig* as PDF plus web formats and close it.
 
     If *file_path* is None the output path is auto-detected from the
     caller's ``__file__`` attribute (writes ``chart.pdf`` next to the
     calling script).
+
+    *web_formats* (default ``WEB_FORMATS``) are written next to the PDF
+    with the same stem, e.g. ``chart.png``. PNG and WebP come from a
+    single raster render at *web_dpi* (default ``WEB_DPI``); WebP needs
+    Pillow and is skipped without it. SVG is written as vector output.
     """
     if file_path is None:
         caller_frame = inspect.stack()[1]
@@ -84,11 +119,72 @@ def save_chart(fig, file_path=None):
         file_path = Path(caller_file).parent / 'chart.pdf'
 
     plt.tight_layout()
-    fig.savefig(file_path, dpi=150, bbox_inches='tight', facecolor='white')
+    # Exports are written below with this call's formats, not by the hook
+    _web_export['paused'] = True
+    try:
+        fig.savefig(file_path, dpi=150, bbox_inches='tight', facecolor='white')
+    finally:
+        _web_export['paused'] = False
+    _save_web_formats(
+        fig, Path(file_path),
+        WEB_FORMATS if web_formats is None else web_formats,
+        WEB_DPI if web_dpi is None else web_dpi,
+    )
     plt.close(fig)
     print(f"Chart saved to: {file_path}")
 
 
+def install_web_export(formats=None, dpi=None):
+    """Make every ``savefig`` to a ``chart.pdf`` also write web formats.
+
+    Chart scripts that call ``plt.savefig`` directly then get the same
+    exports as ``save_chart``: *formats* (default ``WEB_FORMATS``) at
+    *dpi* (default ``WEB_DPI``) next to the PDF. The chart runner and the
+    warm chart worker install this before running a script.
+    """
+    if _web_export['installed']:
+        return
+
+    from matplotlib.figure import Figure
+
+    formats = WEB_FORMATS if formats is None else formats
+    dpi = WEB_DPI if dpi is None else dpi
+    original = Figure.savefig
+
+    @functools.wraps(original)
+    def savefig(self, fname, *args, **kwargs):
+        result = original(self, fname, *args, **kwargs)
+        if (not _web_export['paused'] and isinstance(fname, (str, os.PathLike))
+                and Path(fname).name == 'chart.pdf'):
+            _save_web_formats(self, Path(fname), formats, dpi)
+        return result
+
+    Figure.savefig = savefig
+    _web_export['installed'] = True
+
+
+def _save_web_formats(fig, pdf_path, formats, dpi):
+    """Write *formats* (png, webp, svg) of *fig* next to *pdf_path*."""
+    formats = {f.lower().lstrip('.') for f in formats}
+
+    if formats & {'png', 'webp'}:
+        # Render the raster once and encode it in each requested format
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight', facecolor='white')
+        if 'png' in formats:
+            pdf_path.with_suffix('.png').write_bytes(buffer.getvalue())
+        if 'webp' in formats:
+            try:
+                from PIL import Image
+                buffer.seek(0)
+                Image.open(buffer).save(pdf_path.with_suffix('.webp'), 'WEBP', quality=90, method=4)
+            except ImportError:
+                pass
+
+    if 'svg' in formats:
+        fig.savefig(pdf_path.with_suffix('.svg'), format='svg', bbox_inches='tight', facecolor='white')
+
+
 def add_url(fig, url):
     """Place a small URL in the bottom-right corner of *fig*."""
     plt.figtext(
@@ -100,3 +196,233 @@ def add_url(fig, url):
 def get_chart_dir(caller_file):
     """Return the directory containing *caller_file* as a Path."""
     return Path(caller_file).parent
+
+
+# ---------------------------------------------------------------------------
+# On-disk memoization for expensive computations
+# ---------------------------------------------------------------------------
+CACHE_DIR = Path(os.environ.get(
+    'CHART_CACHE_DIR',
+    Path(__file__).resolve().parents[1] / '.build_cache' / 'chart_memo',
+))
+CACHE_MAX_MB = float(os.environ.get('CHART_CACHE_MAX_MB', 512))
+CACHE_LIBRARIES = ('numpy', 'scipy', 'scikit-learn', 'pandas')
+
+
+def cached(func=None, *, max_mb=None):
+    """Memoize *func* on disk across chart runs.
+
+    The cache key covers the function's source code, its arguments
+    (numpy arrays are hashed by dtype, shape and content) and the Python
+    and library versions. Arguments are bound to the signature with
+    defaults filled in, so ``fit(X, 2)``, ``fit(X, k=2)`` and ``fit(X)``
+    with ``k=2`` as default share an entry. Results are pickled under ``CACHE_DIR``; once
+    the directory exceeds *max_mb* (default ``CACHE_MAX_MB``) the least
+    recently used entries are evicted.
+
+    Everything the function depends on must be passed as an argument --
+    module-level globals are not part of the key.
+
+    Usable as ``@cached`` or ``@cached(max_mb=100)``.
+    """
+    if func is None:
+        return functools.partial(cached, max_mb=max_mb)
+
+    limit_mb = CACHE_MAX_MB if max_mb is None else max_mb
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        signature = None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        hasher = hashlib.sha256()
+        hasher.update(func.__qualname__.encode())
+        hasher.update(source.encode())
+        hasher.update(_library_versions().encode())
+        if signature is not None:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            _hash_value(hasher, dict(bound.arguments))
+        else:
+            _hash_value(hasher, args)
+            _hash_value(hasher, sorted(kwargs.items()))
+        entry = CACHE_DIR / f'{hasher.hexdigest()}.pkl'
+
+        if entry.exists():
+            try:
+                with open(entry, 'rb') as f:
+                    result = pickle.load(f)
+                os.utime(entry)  # mark as recently used
+                return result
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+
+        result = func(*args, **kwargs)
+
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+            _evict_lru(limit_mb)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            pass  # caching is best effort; the result is still valid
+
+        return result
+
+    return wrapper
+
+
+@functools.lru_cache(maxsize=None)
+def _library_versions():
+    """Python and library versions that can change computed results."""
+    parts = [f'python={platform.python_version()}']
+    for lib in CACHE_LIBRARIES:
+        try:
+            parts.append(f'{lib}={metadata.version(lib)}')
+        except metadata.PackageNotFoundError:
+            parts.append(f'{lib}=none')
+    return ';'.join(parts)
+
+
+def _hash_value(hasher, value):
+    """Feed a stable representation of *value* into *hasher*."""
+    if hasattr(value, '__array__') and hasattr(value, 'dtype'):
+        import numpy as np
+        arr = np.ascontiguousarray(value)
+        hasher.update(f'ndarray:{arr.dtype.str}:{arr.shape}'.encode())
+        hasher.update(arr.tobytes() if arr.dtype != object else pickle.dumps(arr.tolist()))
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f'{type(value).__name__}:{len(value)}'.encode())
+        for item in value:
+            _hash_value(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(f'dict:{len(value)}'.encode())
+        for key in sorted(value, key=repr):
+            _hash_value(hasher, key)
+            _hash_value(hasher, value[key])
+    elif isinstance(value, (str, bytes, int, float, bool, complex, range, type(None))):
+        hasher.update(f'{type(value).__name__}:{value!r}'.encode())
+    else:
+        try:
+            hasher.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            hasher.update(repr(value).encode())
+
+
+def _evict_lru(limit_mb):
+    """Delete least recently used cache entries until under *limit_mb*."""
+    entries = []
+    for path in CACHE_DIR.glob('*.pkl'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    limit = limit_mb * 1024 * 1024
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Seeded parallel Monte Carlo trials
+# ---------------------------------------------------------------------------
+TRIAL_WORKERS = int(os.environ.get('CHART_TRIAL_WORKERS', 0)) or os.cpu_count() or 1
+
+
+def parallel_trials(fn, n, seed, workers=None, backend='auto'):
+    """Run *n* independent trials of ``fn(rng)`` and return their results.
+
+    Each trial gets its own ``np.random.Generator`` spawned from
+    ``np.random.SeedSequence(seed)``, so trial *i* always sees the same
+    stream and the returned list (in trial order) is bit-identical for
+    any number of workers.
+
+    Args:
+        fn: Callable taking a Generator; may be a lambda or closure
+        n: Number of trials
+        seed: Integer or sequence of integers seeding the SeedSequence
+        workers: Concurrent workers (default ``CHART_TRIAL_WORKERS`` or CPU count)
+        backend: ``'process'`` (forked workers, for pure-Python loops),
+            ``'thread'`` (for numpy/sklearn code that releases the GIL),
+            or ``'auto'`` (process where fork is available)
+
+    Returns:
+        List of the *n* trial results
+    """
+    import numpy as np
+
+    seeds = np.random.SeedSequence(seed).spawn(n)
+    workers = max(1, min(n, workers or TRIAL_WORKERS))
+
+    if backend == 'auto':
+        # Daemonic processes (e.g. warm chart workers) cannot fork children
+        can_fork = ('fork' in multiprocessing.get_all_start_methods()
+                    and not multiprocessing.current_process().daemon)
+        backend = 'process' if can_fork else 'thread'
+
+    def run_trial(i):
+        return fn(np.random.default_rng(seeds[i]))
+
+    if workers == 1:
+        return [run_trial(i) for i in range(n)]
+    if backend == 'thread':
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run_trial, range(n)))
+    if backend != 'process':
+        raise ValueError(f"Unknown backend: {backend!r}")
+
+    # Forked children inherit fn, so closures and lambdas need no pickling;
+    # only results travel back. Trials are strided so chunks stay balanced.
+    ctx = multiprocessing.get_context('fork')
+    jobs = []
+    for w in range(workers):
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=_trial_chunk,
+                              args=(run_trial, range(w, n, workers), child_conn))
+        process.start()
+        child_conn.close()
+        jobs.append((process, parent_conn))
+
+    results = [None] * n
+    errors = []
+    for process, conn in jobs:
+        try:
+            status, payload = conn.recv()
+        except EOFError:
+            status, payload = 'error', f'trial worker exited with code {process.exitcode}'
+        conn.close()
+        process.join()
+        if status == 'error':
+            errors.append(payload)
+        else:
+            for i, value in payload:
+                results[i] = value
+
+    if errors:
+        raise RuntimeError(f"parallel_trials failed:\n{errors[0]}")
+    return results
+
+
+def _trial_chunk(run_trial, indices, conn):
+    """Forked worker: run a slice of trials and send back (index, result) pairs."""
+    try:
+        conn.send(('ok', [(i, run_trial(i)) for i in indices]))
+    except BaseException:
+        conn.send(('error', traceback.format_exc()))
+    finally:
+        conn.close()